@@ -1,24 +1,30 @@
-import json
+import asyncio
+import atexit
+import functools
+import io
 import logging
 import logging.handlers
 import os
 import platform
 import queue
 import re
-import shutil
 import sys
+import time
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
 from datetime import timedelta
 
 import discord
+import orjson
 import psutil
-from cachetools import TTLCache
+from cachetools import LRUCache, TTLCache
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
-from utils.cache_utils import get_cache_stats, load_bad_words
-from utils.command_utils import setup_command_execution, handle_cancel_request, apply_cooldown, save_scan_results
-from utils.search_utils import process_search_channels, update_search_status, update_search_stats
+from utils.cache_utils import get_cache_stats, load_bad_words, measure_cache
+from utils.command_utils import setup_command_execution, handle_cancel_request, apply_cooldown, save_scan_results, write_export_file
+from utils.log_utils import BatchingQueueListener, CachedTimeFormatter, DeleteCounter, DropOldestQueueHandler, HourlyLogHandler, clear_log_folders, update_delete_progress
+from utils.search_utils import can_read_history, count_search, format_search_status, prefetch, process_search_channels, scan_channels_concurrently, stop_status_updates, update_search_stats, update_status_periodically
 
 
 # --- Environment check ---
@@ -61,21 +67,7 @@ def check_environment():
         if detected and message:  # Only add warning if there's a message to display
             warnings.append(message)
 
-    # Check internet connection (only on posix systems)
-    if os.name == 'posix':
-        try:
-            import subprocess
-            subprocess.run(
-                ["ping", "-c", "1", "8.8.8.8"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=2  # Add timeout to prevent hanging
-            )
-        except (subprocess.SubprocessError, FileNotFoundError):
-            warnings.append("No internet connection detected. DeepSearch cannot connect to Discord.")
-            exit()  # Exit if no internet connection
-
+    # Connectivity isn't probed here, connection problems are reported by discord.py when the bot starts
     return warnings
 
 # Display environment warnings
@@ -94,45 +86,39 @@ load_dotenv()
 TOKEN = os.getenv("BOT_TOKEN")
 CONFIG_FILE = "config.json"
 
-with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-    CONFIG = json.load(f)
+with open(CONFIG_FILE, "rb") as f:
+    CONFIG = orjson.loads(f.read())
+
+# Serialized config as last written by flush_config, seeded with the loaded file so a no-op first save is skipped
+last_saved_config = orjson.dumps(CONFIG, option=orjson.OPT_INDENT_2)
+# Pending flush_config task, if a write is scheduled or running
+config_flush_task = None
 
 # --- Setup logs ---
 LOGS_DIR = "logs"
+LOGS_DIR_B = os.fsencode(os.path.abspath(LOGS_DIR))  # Precomputed bytes path for bulk file operations
 os.makedirs(LOGS_DIR, exist_ok=True)
-msg_log_path = os.path.join(LOGS_DIR, "message_logs.log")
-user_log_path = os.path.join(LOGS_DIR, "user_logs.log")
+LOG_QUEUE_MAX = 50000
 
 
 def setup_logging():
-    # Create date-based directory structure
-    current_datetime = datetime.now()
-    date_hour_dir = os.path.join(LOGS_DIR, current_datetime.strftime('%Y-%m-%d_%H'))
-    os.makedirs(date_hour_dir, exist_ok=True)
-
-    # Define log paths with date-based directory
-    msg_log_path = os.path.join(date_hour_dir, "message_logs.log")
-    user_log_path = os.path.join(date_hour_dir, "user_logs.log")
-
-    # Set up logging with queue handlers for thread safety
-    log_queue = queue.Queue(-1)  # No limit on queue size
-    queue_handler = logging.handlers.QueueHandler(log_queue)
-
-    # Configure root logger to use the queue
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    for handler in root_logger.handlers[:]:  # Remove any existing handlers
-        root_logger.removeHandler(handler)
-    root_logger.addHandler(queue_handler)
-
-    # Configure file handlers for the listener
-    msg_handler = logging.FileHandler(msg_log_path, mode='a', encoding='utf-8')
-    user_handler = logging.FileHandler(user_log_path, mode='a', encoding='utf-8')
-
-    formatter = logging.Formatter('%(asctime)s - %(message)s')
+    # Set up logging with queue handlers so file writes happen off the event loop
+    # Bounded so a burst of matches cannot grow memory without limit, the oldest records are dropped first
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_MAX)
+    queue_handler = DropOldestQueueHandler(log_queue)
+
+    # Configure file handlers for the listener, they write to a new date-hour folder every hour
+    msg_handler = HourlyLogHandler(LOGS_DIR, "message_logs.log")
+    user_handler = HourlyLogHandler(LOGS_DIR, "user_logs.log")
+
+    formatter = CachedTimeFormatter('%(asctime)s - %(message)s')
     msg_handler.setFormatter(formatter)
     user_handler.setFormatter(formatter)
 
+    # The listener hands every record to every handler, so route them by logger name
+    msg_handler.addFilter(logging.Filter('message_log'))
+    user_handler.addFilter(logging.Filter('user_log'))
+
     # Create and configure loggers
     msg_logger = logging.getLogger('message_log')
     user_logger = logging.getLogger('user_log')
@@ -143,14 +129,18 @@ def setup_logging():
     msg_logger.propagate = False
     user_logger.propagate = False
 
-    msg_logger.addHandler(msg_handler)
-    user_logger.addHandler(user_handler)
+    msg_logger.addHandler(queue_handler)
+    user_logger.addHandler(queue_handler)
 
-    # Set up the queue listener
-    listener = logging.handlers.QueueListener(log_queue, msg_handler, user_handler)
+    # Set up the queue listener, which writes the records from a background thread
+    # and flushes the files whenever it has caught up with the queue
+    listener = BatchingQueueListener(log_queue, msg_handler, user_handler)
     listener.start()
 
-    return msg_logger, user_logger, msg_log_path, user_log_path, listener
+    # Flush any queued records on shutdown
+    atexit.register(listener.stop)
+
+    return msg_logger, user_logger, msg_handler, user_handler, listener
 
 
 # --- Init bot ---
@@ -159,32 +149,74 @@ intents.members = True
 intents.message_content = True
 bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
 
-msg_logger, user_logger, msg_log_path, user_log_path, log_listener = setup_logging()
+msg_logger, user_logger, msg_handler, user_handler, log_listener = setup_logging()
 
 BAD_WORDS = load_bad_words()
 
 # --- Caches ---
-member_cache = TTLCache(maxsize=500, ttl=3600)  # Cache for 1 hour, store up to 500 guilds
+member_cache = LRUCache(maxsize=500)  # Kept current by the member events, store up to 500 guilds
 message_cache = TTLCache(maxsize=1000, ttl=300)  # Cache for 5 minutes, store up to 1000 channel histories
-user_cache = TTLCache(maxsize=2000, ttl=3600)  # Cache for 1 hour, store up to 2000 users
-keyword_match_cache = TTLCache(maxsize=10000, ttl=3600)  # Cache for 1 hour
+user_cache = TTLCache(maxsize=10000, ttl=3600)  # Cache for 1 hour so names and avatars get refreshed, store up to 10000 users
+context_cache = TTLCache(maxsize=128, ttl=300)  # Rendered !context results, store up to 128 for 5 minutes
+sysinfo_cache = TTLCache(maxsize=1, ttl=5)  # Last !sysinfo embed, reused for 5 seconds
+
+# Channel ID -> context_cache keys for that channel, so invalidation doesn't scan the whole cache
+context_keys_by_channel = defaultdict(set)
+
+
+# Recent message ID -> channel ID, lets !context find a message without probing every channel
+recent_msg_channel = OrderedDict()
+RECENT_MSG_CHANNEL_MAX = 100000
+
+# Channel ID -> searchable messages received since connecting (newest first), searched before asking the API for older history
+# Only the most recently active channels are kept, the others fall back to the API
+RECENT_MESSAGES_PER_CHANNEL = 500
+RECENT_MESSAGE_CHANNELS_MAX = 100
+recent_messages = OrderedDict()
 
 
 # --- Utils ---
-def save_config():
+def write_config(data):
+    """Atomically replace the config file with already serialized data, returning whether it worked"""
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(CONFIG, f, indent=2)
+        tmp_file = f"{CONFIG_FILE}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, CONFIG_FILE)
+        return True
     except Exception as e:
         print(f"Error saving config: {e}")
+        return False
 
 
-def log_to_file(path, content):
-    try:
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(content)
-    except Exception as e:
-        print(f"Error writing to log {path}: {e}")
+async def flush_config(delay=1):
+    """Write the config after a short delay, so several changes in a row are saved together"""
+    global last_saved_config
+    await asyncio.sleep(delay)
+    # Changes made while a write is in progress are picked up by the next pass
+    while True:
+        data = orjson.dumps(CONFIG, option=orjson.OPT_INDENT_2)
+        # Commands like !autoscan on can leave the config unchanged, skip rewriting identical content
+        if data == last_saved_config:
+            return
+        if not await bot.loop.run_in_executor(None, write_config, data):
+            return
+        last_saved_config = data
+
+
+def save_config():
+    """Schedule the config to be written to disk off the event loop"""
+    global config_flush_task
+    if config_flush_task is None or config_flush_task.done():
+        config_flush_task = bot.loop.create_task(flush_config())
+
+
+@atexit.register
+def flush_config_on_exit():
+    """Write pending config changes on shutdown"""
+    data = orjson.dumps(CONFIG, option=orjson.OPT_INDENT_2)
+    if config_flush_task is not None and data != last_saved_config:
+        write_config(data)
 
 
 def is_admin(ctx):
@@ -249,13 +281,91 @@ def update_scheduled_tasks():
             print("🛑 Auto-scan disabled")
 
 
+def remember_message_channel(message_id, channel_id):
+    """Record which channel a message was posted in, dropping the oldest entries past the limit"""
+    recent_msg_channel[message_id] = channel_id
+    if len(recent_msg_channel) > RECENT_MSG_CHANNEL_MAX:
+        recent_msg_channel.popitem(last=False)
+
+
+def remember_recent_message(msg):
+    """Add a message to its channel's recent history, dropping the least recently active channel past the limit"""
+    recent = recent_messages.get(msg.channel.id)
+    if recent is None:
+        recent = recent_messages[msg.channel.id] = deque(maxlen=RECENT_MESSAGES_PER_CHANNEL)
+        if len(recent_messages) > RECENT_MESSAGE_CHANNELS_MAX:
+            recent_messages.popitem(last=False)
+    else:
+        recent_messages.move_to_end(msg.channel.id)
+    recent.appendleft(msg)
+
+
 def get_cached_members(guild_id):
-    """Get or create cached member list for a guild"""
+    """Get or create the cached member name index (member ID -> name fields) for a guild"""
     if guild_id not in member_cache:
         guild = bot.get_guild(guild_id)
         if guild:
-            member_cache[guild_id] = list(guild.members)
-    return member_cache.get(guild_id, [])
+            # Only keep the text that keyword scans need, the members themselves stay in discord.py's cache
+            member_cache[guild_id] = {member.id: f"{member.name} {member.display_name}" for member in guild.members}
+    return member_cache.get(guild_id, {})
+
+
+def update_cached_member(member):
+    """Refresh a member's name fields in its guild's cached name index, if that guild is cached"""
+    name_index = member_cache.get(member.guild.id)
+    if name_index is not None:
+        name_index[member.id] = f"{member.name} {member.display_name}"
+
+
+async def channel_history(channel, limit, after=None):
+    """Yield up to limit messages from a channel, newest first, starting with the ones received by on_message
+
+    The in-memory part skips bot and empty messages, which keyword searches can't match anyway.
+
+    When after is given, stop at the first message created before it instead of paging further back.
+    """
+    # The whole channel is older than the cutoff, don't request anything
+    if after is not None and channel.last_message_id and discord.utils.snowflake_time(channel.last_message_id) < after:
+        return
+
+    count = 0
+    oldest = None
+    # Copy the deque since on_message can add to it while we're yielding
+    for msg in list(recent_messages.get(channel.id, ())):
+        if count >= limit or (after is not None and msg.created_at < after):
+            return
+        yield msg
+        count += 1
+        oldest = msg
+
+    # Only fetch the part of the history that isn't in memory
+    if count < limit:
+        async for msg in prefetch(channel.history(limit=limit - count, before=oldest)):
+            if after is not None and msg.created_at < after:
+                return
+            yield msg
+
+
+def forget_recent_messages(channel_id, message_ids):
+    """Remove deleted messages from a channel's recent history"""
+    recent = recent_messages.get(channel_id)
+    if not recent:
+        return
+    kept = [msg for msg in recent if msg.id not in message_ids]
+    if len(kept) != len(recent):
+        recent.clear()
+        recent.extend(kept)
+
+
+def replace_recent_message(message):
+    """Swap an edited message into its channel's recent history, so searches match the new content"""
+    recent = recent_messages.get(message.channel.id)
+    if not recent:
+        return
+    for i, cached in enumerate(recent):
+        if cached.id == message.id:
+            recent[i] = message
+            return
 
 
 async def get_cached_messages(channel_id, limit=100, force_refresh=False):
@@ -264,8 +374,9 @@ async def get_cached_messages(channel_id, limit=100, force_refresh=False):
     if force_refresh or cache_key not in message_cache:
         channel = bot.get_channel(channel_id)
         if channel:
+            # !context shows every message, so read the full history rather than the searchable recent one
             messages = []
-            async for msg in channel.history(limit=limit):
+            async for msg in prefetch(channel.history(limit=limit)):
                 messages.append(msg)
             message_cache[cache_key] = messages
     return message_cache.get(cache_key, [])
@@ -282,27 +393,43 @@ async def get_cached_user(user_id):
     return user_cache.get(user_id)
 
 
-# Create a set of lowercase keywords for faster matching
-KEYWORD_SET = {k.lower() for k in CONFIG["search_keywords"]}
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern, flags=0):
+    """Compile a user-supplied pattern, reusing it when the same query is run again"""
+    return re.compile(pattern, flags)
 
 
-def keyword_match(text):
-    """Check if text contains any keywords with caching"""
-    # Use a short hash of the text as a cache key
-    cache_key = hash(text) % 10000000
+class KeywordMatcher:
+    """Case-insensitive matcher for a keyword list, replaced as a whole when the keywords change"""
+
+    def __init__(self, keywords):
+        # Keywords differing only by case would add duplicate branches to the pattern
+        unique_keywords = dict.fromkeys(k.lower() for k in keywords)
+        # Match all keywords in one regex scan instead of one substring check per keyword
+        self.pattern = re.compile("|".join(re.escape(k) for k in unique_keywords), re.IGNORECASE) if unique_keywords else None
+        # Text shorter than the shortest keyword cannot match, most chat messages are skipped without running the regex
+        self.min_len = min((len(k) for k in unique_keywords), default=0)
+
+    def matches(self, text):
+        """Check if text contains any of the keywords"""
+        if self.pattern is None or len(text) < self.min_len:
+            return False
+        return self.pattern.search(text) is not None
 
-    if cache_key in keyword_match_cache:
-        return keyword_match_cache[cache_key]
 
-    # Convert text to lowercase once
-    text_lower = text.lower()
+keyword_matcher = KeywordMatcher(CONFIG["search_keywords"])
 
-    # Check for any keyword in the set
-    result = any(k in text_lower for k in KEYWORD_SET)
 
-    # Cache the result
-    keyword_match_cache[cache_key] = result
-    return result
+def keyword_match(text):
+    """Check if text contains any keywords"""
+    # Read the global once so a concurrent !setkeywords can't mix the old and new keywords
+    return keyword_matcher.matches(text)
+
+
+def find_matching_members(name_index):
+    """Return the IDs of the members whose name or display name contains a keyword"""
+    # Runs in a worker thread, copy the items so member events on the loop can't change the dict mid-iteration
+    return [member_id for member_id, name_fields in list(name_index.items()) if keyword_match(name_fields)]
 
 
 def parse_query_limit(limit_str):
@@ -319,6 +446,41 @@ def parse_query_limit(limit_str):
         return None
 
 
+# Flags that take a value, mapped to the key they set
+VALUE_FLAGS = {
+    "--q": "query_limit", "--query": "query_limit",
+    "--in": "include_channels", "--channel": "include_channels",
+    "--exclude": "exclude_channels", "--not": "exclude_channels",
+}
+
+# Boolean flags, mapped to the key they set
+BOOL_FLAGS = {
+    "--all": "deep_search", "-a": "deep_search",
+    "--debug": "debug", "-d": "debug",
+    "--users": "scan_users", "-u": "scan_users",
+    "--messages": "scan_messages", "-m": "scan_messages",
+}
+
+
+# Badscan options that take a value, given as "--flag value" or "--flag=value"
+BADSCAN_VALUE_FLAGS = frozenset({"--in", "--strictness", "--lang", "--user"})
+
+
+def parse_flag_values(args, names):
+    """Collect every value given to the named flags, in order, with a single pass over args"""
+    values = {}
+    for i, arg in enumerate(args):
+        name, sep, value = arg.partition("=")
+        if name not in names:
+            continue
+        if not sep:
+            if i + 1 >= len(args):
+                continue
+            value = args[i + 1]
+        values.setdefault(name, []).append(value)
+    return values
+
+
 # Unified argument parsing function
 def parse_command_args(args):
     """Parse command arguments and separate flags from positional arguments"""
@@ -330,28 +492,21 @@ def parse_command_args(args):
         arg = args[i].lower()
 
         # Handle flags that take a value
-        if i + 1 < len(args) and arg in ("--q", "--query"):
-            limit = parse_query_limit(args[i + 1])
-            if limit is not None:
-                flags["query_limit"] = limit
-                i += 1  # Skip the value
-            else:
-                flags["error"] = "Invalid query limit. Must be a number (e.g., 100, 5k, 1m)."
-        elif i + 1 < len(args) and arg in ("--in", "--channel"):
-            flags["include_channels"] = [c.strip() for c in args[i + 1].split(",")]
-            i += 1  # Skip the value
-        elif i + 1 < len(args) and arg in ("--exclude", "--not"):
-            flags["exclude_channels"] = [c.strip() for c in args[i + 1].split(",")]
+        value_key = VALUE_FLAGS.get(arg)
+        if value_key and i + 1 < len(args):
+            value = args[i + 1]
             i += 1  # Skip the value
+            if value_key == "query_limit":
+                limit = parse_query_limit(value)
+                if limit is not None:
+                    flags["query_limit"] = limit
+                else:
+                    flags["error"] = "Invalid query limit. Must be a number (e.g., 100, 5k, 1m)."
+            else:
+                flags[value_key] = [c.strip() for c in value.split(",")]
         # Handle boolean flags
-        elif arg in ("--all", "-a"):
-            flags["deep_search"] = True
-        if "--debug" in args or "-d" in args:
-            flags["debug"] = True
-        elif arg in ("--users", "-u"):
-            flags["scan_users"] = True
-        elif arg in ("--messages", "-m"):
-            flags["scan_messages"] = True
+        elif arg in BOOL_FLAGS:
+            flags[BOOL_FLAGS[arg]] = True
         else:
             processed_args.append(args[i])
 
@@ -372,69 +527,102 @@ def debug_print(message, debug_enabled=False):
 async def on_ready():
     print(f"✅ Logged in as {bot.user}")
     print("🔍 Keywords:", ', '.join(CONFIG["search_keywords"]))
-    print(f"📁 Logs at {os.path.dirname(msg_log_path)}")
+    print(f"📁 Logs at {os.path.dirname(msg_handler.baseFilename)}")
 
     update_scheduled_tasks()
+    if not flush_search_stats.is_running():
+        flush_search_stats.start()
+
+    # on_ready fires again after reconnects, only scan once per run and only when enabled
+    if not CONFIG.get("initial_scan_on_ready", False) or getattr(bot, "initial_scan_task", None):
+        return
 
-    # Track message matches for initial scan
-    initial_message_matches = 0
-    initial_member_matches = 0
-    total_members_scanned = 0
-    total_messages_scanned = 0
-    guild_count = len(bot.guilds)
+    # Run the initial scan in the background so on_ready returns and the heartbeat keeps running
+    bot.initial_scan_task = bot.loop.create_task(run_initial_scan())
+
+
+async def initial_scan(guild):
+    """Scan a guild's members and recent messages, returning (member matches, members, message matches, messages)"""
+    # Build the member name index, yielding to the event loop every 1000 members
+    name_index = {}
+    for i, member in enumerate(guild.members, 1):
+        name_index[member.id] = f"{member.name} {member.display_name}"
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+    member_cache[guild.id] = name_index
+    member_count = len(name_index)
+
+    # Match member names in a worker thread so the event loop stays responsive
+    matching_ids = await bot.loop.run_in_executor(None, find_matching_members, name_index)
+    member_matches = len(matching_ids)
+    for member_id in matching_ids:
+        member = guild.get_member(member_id) or member_id
+        entry = f"[AUTO] {member} ({member_id}) in {guild.name}"
+        user_logger.info(entry)
+        if CONFIG["print_user_matches"]:
+            print(entry)
 
-    print(f"\n🔎 Starting initial scan across {guild_count} guilds...")
+    # Initial scan of messages
+    message_matches = 0
+    message_scan_count = 0
+    channels = [c for c in guild.text_channels if can_read_history(c, guild.me)]
 
-    for guild in bot.guilds:
-        # Chunk only if necessary
-        if not guild.chunked:
-            await guild.chunk(cache=True)
+    if channels:
+        # Calculate messages per channel to reach approximately 5000 total
+        messages_per_channel = max(1, 5000 // len(channels))
+
+        async def scan_channel(channel):
+            """Log the keyword matches among one channel's recent messages"""
+            nonlocal message_matches, message_scan_count
+            try:
+                async for msg in channel.history(limit=messages_per_channel):
+                    message_scan_count += 1
+                    if keyword_match(msg.content):
+                        message_matches += 1
+                        entry = f"[INIT] {msg.author} in #{channel.name} ({guild.name}) > {msg.content}"
+                        msg_logger.info(entry)
+                        if CONFIG["print_message_matches"]:
+                            print(entry)
+            except (discord.Forbidden, Exception):
+                return
 
-        # Scan members
-        member_count = len(guild.members)
-        total_members_scanned += member_count
+        # Fetch channel histories concurrently, each network round-trip overlaps the others
+        await scan_channels_concurrently(channels, scan_channel)
 
-        member_matches = 0
-        for member in get_cached_members(guild.id):
-            name_fields = f"{member.name} {member.display_name}"
-            if keyword_match(name_fields):
-                initial_member_matches += 1
-                member_matches += 1
-                entry = f"[AUTO] {member} ({member.id}) in {guild.name}"
-                user_logger.info(entry)
-                if CONFIG["print_user_matches"]:
-                    print(entry)
+    print(f"  • {guild.name}: {member_matches}/{member_count} members, {message_scan_count} messages scanned")
+    return member_matches, member_count, message_matches, message_scan_count
 
-        # Initial scan of messages
-        message_scan_count = 0
-        channels = [c for c in guild.text_channels if c.permissions_for(guild.me).read_messages]
 
-        if channels:
-            # Calculate messages per channel to reach approximately 5000 total
-            messages_per_channel = max(1, 5000 // len(channels))
+async def run_initial_scan():
+    """Scan every guild for keyword matches when the bot starts"""
+    print(f"\n🔎 Starting initial scan across {len(bot.guilds)} guilds...")
 
-            for channel in channels:
-                try:
-                    async for msg in channel.history(limit=messages_per_channel):
-                        message_scan_count += 1
-                        if keyword_match(msg.content):
-                            initial_message_matches += 1
-                            entry = f"[INIT] {msg.author} in #{channel.name} ({guild.name}) > {msg.content}"
-                            msg_logger.info(entry)
-                            if CONFIG["print_message_matches"]:
-                                print(entry)
-                except (discord.Forbidden, Exception):
-                    continue
+    # Chunk the guilds that need it concurrently rather than one after another
+    await asyncio.gather(*(guild.chunk(cache=True) for guild in bot.guilds if not guild.chunked),
+                         return_exceptions=True)
 
-        total_messages_scanned += message_scan_count
-        print(f"  • {guild.name}: {member_matches}/{member_count} members, {message_scan_count} messages scanned")
+    results = await asyncio.gather(*(initial_scan(guild) for guild in bot.guilds), return_exceptions=True)
+    totals = [0, 0, 0, 0]
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"⚠️ Initial scan failed for a guild: {result}")
+            continue
+        totals = [total + value for total, value in zip(totals, result)]
 
+    initial_member_matches, total_members_scanned, initial_message_matches, total_messages_scanned = totals
     print(f"\n✅ Initial scan complete! Found {initial_member_matches}/{total_members_scanned} matching members and {initial_message_matches}/{total_messages_scanned} matching messages.")
 
 
 @bot.event
 async def on_message(msg):
-    if msg.author.bot or not msg.guild:
+    if msg.guild:
+        remember_message_channel(msg.id, msg.channel.id)
+        forget_context(msg.channel.id)
+        # Searches skip bot and empty messages, so don't hold on to them
+        if not msg.author.bot and msg.content:
+            remember_recent_message(msg)
+    # Embed or attachment-only messages have no text to match and can't be commands
+    if msg.author.bot or not msg.guild or not msg.content:
         return
     if keyword_match(msg.content):
         entry = f"[AUTO] {msg.author} in #{msg.channel} ({msg.guild.name}) > {msg.content}"
@@ -444,14 +632,82 @@ async def on_message(msg):
     await bot.process_commands(msg)
 
 
+@bot.event
+async def on_member_join(member):
+    update_cached_member(member)
+
+
+@bot.event
+async def on_member_update(before, after):
+    if before.display_name != after.display_name:
+        update_cached_member(after)
+
+
+@bot.event
+async def on_user_update(before, after):
+    # Username and global name changes show up in every guild the user shares with the bot,
+    # the global name feeds display_name for members without a server nickname
+    if before.name != after.name or before.global_name != after.global_name:
+        for guild in after.mutual_guilds:
+            member = guild.get_member(after.id)
+            if member:
+                update_cached_member(member)
+
+
+@bot.event
+async def on_member_remove(member):
+    name_index = member_cache.get(member.guild.id)
+    if name_index is not None:
+        name_index.pop(member.id, None)
+
+
+@bot.event
+async def on_guild_remove(guild):
+    member_cache.pop(guild.id, None)
+    for channel in guild.text_channels:
+        recent_messages.pop(channel.id, None)
+
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    recent_messages.pop(channel.id, None)
+    forget_context(channel.id)
+
+
+@bot.event
+async def on_raw_message_edit(payload):
+    replace_recent_message(payload.message)
+    forget_context(payload.channel_id)
+
+
+@bot.event
+async def on_raw_message_delete(payload):
+    forget_recent_messages(payload.channel_id, {payload.message_id})
+    forget_context(payload.channel_id)
+
+
+@bot.event
+async def on_raw_bulk_message_delete(payload):
+    forget_recent_messages(payload.channel_id, payload.message_ids)
+    forget_context(payload.channel_id)
+
+
+@bot.event
+async def on_disconnect():
+    # Messages sent while disconnected never reach on_message, so the recent history would have gaps
+    recent_messages.clear()
+
+
 # --- Commands Section---
 @bot.command(name="setkeywords")
 async def set_keywords(ctx, *, words):
     if not is_admin(ctx):
         return await ctx.send("❌ You must be a server admin to use this.")
-    new_words = [w.strip() for w in words.split(",") if w.strip()]
+    global keyword_matcher
+    new_words = list(dict.fromkeys(w.strip() for w in words.split(",") if w.strip()))
     CONFIG["search_keywords"] = new_words
     save_config()
+    keyword_matcher = KeywordMatcher(new_words)
     await ctx.send(f"✅ Keywords updated: {', '.join(new_words)}")
 
 
@@ -539,97 +795,126 @@ async def scan_members(ctx, *args):
     try:
         user_count = 0
         message_count = 0
-        start_time = datetime.now()
-        last_update_time = start_time
+        start_time = time.monotonic()
 
         # Scan members if requested
         if scan_users:
-            # Ensure guild is chunked for complete member list
-            if not ctx.guild.chunked:
+            # Ensure guild is chunked for complete member list, unless its name index is already cached
+            if ctx.guild.id not in member_cache and not ctx.guild.chunked:
                 await ctx.guild.chunk(cache=True)
 
-            total_members = len(ctx.guild.members)
+            # Snapshot the index, member events can update it while we wait on status edits
+            members = list(get_cached_members(ctx.guild.id).items())
+            total_members = len(members)
             members_scanned = 0
 
-            for member in ctx.guild.members:
-                members_scanned += 1
+            def render_member_status():
+                progress = members_scanned / total_members * 100 if total_members else 100
+                time_elapsed = time.monotonic() - start_time
+                return f"🔍 {scanning_text} members... ({members_scanned}/{total_members}, {progress:.1f}%, {time_elapsed:.1f}s)"
 
-                # Update status periodically
-                current_time = datetime.now()
-                if (current_time - last_update_time).total_seconds() > 5:
-                    progress = members_scanned / total_members * 100
-                    time_elapsed = (current_time - start_time).total_seconds()
-                    await status_msg.edit(content=f"🔍 {scanning_text} members... ({members_scanned}/{total_members}, {progress:.1f}%, {time_elapsed:.1f}s)")
-                    last_update_time = current_time
+            # Update status periodically in the background so the scan never waits on an edit
+            status_task = bot.loop.create_task(update_status_periodically(status_msg, render_member_status))
+            try:
+                for member_id, name_fields in members:
+                    members_scanned += 1
 
-                # Check for cancellation
-                if search_cancelled:
-                    await status_msg.edit(content=f"⚠️ Scan cancelled after checking {members_scanned} members.")
-                    return
-
-                name_fields = f"{member.name} {member.display_name}"
-                if keyword_match(name_fields):
-                    user_count += 1
-                    entry = f"[SCAN] {member.name} ({member.id}) in {ctx.guild.name}"
-                    user_logger.info(entry)
-                    if CONFIG["print_user_matches"]:
-                        print(entry)
+                    # Yield every 1000 members so the status updates and other events get to run
+                    if members_scanned % 1000 == 0:
+                        await asyncio.sleep(0)
+
+                    # Check for cancellation
+                    if search_cancelled:
+                        break
+
+                    if keyword_match(name_fields):
+                        user_count += 1
+                        member = ctx.guild.get_member(member_id)
+                        entry = f"[SCAN] {member.name if member else member_id} ({member_id}) in {ctx.guild.name}"
+                        user_logger.info(entry)
+                        if CONFIG["print_user_matches"]:
+                            print(entry)
+            finally:
+                await stop_status_updates(status_task)
+
+            if search_cancelled:
+                await status_msg.edit(content=f"⚠️ Scan cancelled after checking {members_scanned} members.")
+                return
 
         # Scan messages if requested
         if scan_messages:
             # Prepare search channels
+            # text_channels rebuilds its list on every access, so look it up once per command
+            channels = ctx.guild.text_channels
+            me = ctx.guild.me
             search_channels = []
             if include_channels:
                 for ch_name in include_channels:
                     ch_name = ch_name.strip('#')
-                    channel = discord.utils.get(ctx.guild.text_channels, name=ch_name)
+                    channel = discord.utils.get(channels, name=ch_name)
                     if channel:
                         search_channels.append(channel)
             else:
                 if exclude_channels:
-                    exclude_ch_names = [ch.strip('#') for ch in exclude_channels]
-                    search_channels = [ch for ch in ctx.guild.text_channels
+                    exclude_ch_names = {ch.strip('#') for ch in exclude_channels}
+                    search_channels = [ch for ch in channels
                                        if ch.name not in exclude_ch_names]
                 else:
-                    search_channels = ctx.guild.text_channels
+                    search_channels = channels
+
+            # Skip channels whose history we can't read instead of waiting for a Forbidden response
+            search_channels = [ch for ch in search_channels if can_read_history(ch, me)]
 
             total_channels = len(search_channels)
             channels_scanned = 0
             total_messages_scanned = 0
 
-            for channel in search_channels:
+            # Use different limits based on deep search setting
+            limit = query_limit if deep_search or custom_query else 100
+
+            async def scan_channel(channel):
+                """Scan one channel's history and return its matching messages"""
+                nonlocal channels_scanned, total_messages_scanned
+                matches = []
+                async for msg in prefetch(channel.history(limit=limit)):
+                    # Check for cancellation
+                    if search_cancelled:
+                        break
+
+                    total_messages_scanned += 1
+                    if keyword_match(msg.content):
+                        matches.append(msg)
+
                 channels_scanned += 1
+                return matches
 
-                # Check for cancellation
-                if search_cancelled:
-                    await status_msg.edit(content=f"⚠️ Scan cancelled after scanning {channels_scanned}/{total_channels} channels.")
-                    return
+            def render_status():
+                progress = channels_scanned / total_channels * 100 if total_channels else 100
+                time_elapsed = time.monotonic() - start_time
+                return f"🔍 {scanning_text} messages... ({channels_scanned}/{total_channels} channels, {total_messages_scanned} msgs, {progress:.1f}%, {time_elapsed:.1f}s)"
 
-                # Update status periodically
-                current_time = datetime.now()
-                if (current_time - last_update_time).total_seconds() > 5:
-                    progress = channels_scanned / total_channels * 100
-                    time_elapsed = (current_time - start_time).total_seconds()
-                    await status_msg.edit(content=f"🔍 {scanning_text} messages... ({channels_scanned}/{total_channels} channels, {total_messages_scanned} msgs, {progress:.1f}%, {time_elapsed:.1f}s)")
-                    last_update_time = current_time
+            # Update status periodically in the background so the scan never waits on an edit
+            status_task = bot.loop.create_task(update_status_periodically(status_msg, render_status))
+            try:
+                # Fetch channel histories concurrently, each network round-trip overlaps the others
+                results = await scan_channels_concurrently(search_channels, scan_channel)
+            finally:
+                await stop_status_updates(status_task)
 
-                try:
-                    # Use different limits based on deep search setting
-                    limit = query_limit if deep_search or custom_query else 100
-                    async for msg in channel.history(limit=limit):
-                        total_messages_scanned += 1
-
-                        if keyword_match(msg.content):
-                            message_count += 1
-                            entry = f"[SCAN] {msg.author} in #{channel.name} ({ctx.guild.name}) > {msg.content}"
-                            msg_logger.info(entry)
-                            if CONFIG["print_message_matches"]:
-                                print(entry)
-                except discord.Forbidden:
-                    continue
+            if search_cancelled:
+                await status_msg.edit(content=f"⚠️ Scan cancelled after scanning {channels_scanned}/{total_channels} channels.")
+                return
+
+            for channel, matches in results:
+                for msg in matches:
+                    message_count += 1
+                    entry = f"[SCAN] {msg.author} in #{channel.name} ({ctx.guild.name}) > {msg.content}"
+                    msg_logger.info(entry)
+                    if CONFIG["print_message_matches"]:
+                        print(entry)
 
         # Calculate scan time
-        scan_time = (datetime.now() - start_time).total_seconds()
+        scan_time = time.monotonic() - start_time
 
         # Format the result message
         result_parts = []
@@ -659,13 +944,13 @@ async def search_messages(ctx, *args):
     if not is_admin(ctx):
         return await ctx.send("❌ You must be a server admin to use this.")
 
-    global search_cancelled, search_cooldowns
+    global search_cooldowns
 
     # Handle cancel request
     cancel_result = handle_cancel_request(search_messages, args)
     if cancel_result is not None:
         if cancel_result:
-            search_cancelled = True
+            search_messages.cancel_event.set()
             return await ctx.send("⚠️ Search cancelled.")
         else:
             return await ctx.send("⚠️ No search is currently running.")
@@ -674,7 +959,9 @@ async def search_messages(ctx, *args):
     if not setup_command_execution(search_messages):
         return await ctx.send("⚠️ A search is already running. Please wait for it to complete or use `!search cancel` to stop it.")
 
-    search_cancelled = False
+    # Per-search cancellation flag shared by all channel workers
+    search_messages.cancel_event = asyncio.Event()
+    cancel_event = search_messages.cancel_event
 
     # Use the unified argument parsing function
     processed_args, flags = parse_command_args(args)
@@ -749,76 +1036,90 @@ async def search_messages(ctx, *args):
         total_channels = len(search_channels)
         found_messages = []
         total_searched = 0
-        start_time = datetime.now()
-        last_update_time = start_time
+        start_time = time.monotonic()
         channels_searched = 0
 
-        for channel in search_channels:
-            channels_searched += 1
+        # Use different limits based on deep search setting
+        limit = query_limit if deep_search or custom_query else 100
+
+        # Case-insensitive pattern avoids lowercasing every message
+        keyword_re = compile_pattern(re.escape(keyword), re.IGNORECASE)
+
+        async def search_channel(channel):
+            """Collect the target user's messages containing the keyword from one channel"""
+            nonlocal total_searched, channels_searched
 
             # Check for cancellation
-            if search_cancelled:
-                await status_msg.edit(content=f"⚠️ Search cancelled after checking {channels_searched}/{total_channels} channels.")
+            if cancel_event.is_set():
                 return
 
+            channels_searched += 1
             try:
-                # Use different limits based on deep search setting
-                limit = query_limit if deep_search or custom_query else 100
-
-                messages_checked = 0
-                async for msg in channel.history(limit=limit):
-                    messages_checked += 1
-                    total_searched += 1
-
-                    # Update status message periodically
-                    last_update_time = await update_search_status(
-                        status_msg,
-                        channels_searched,
-                        total_channels,
-                        total_searched,
-                        len(found_messages),
-                        start_time,
-                        last_update_time,
-                        search_cancelled
-                    )
-
+                # Nothing older than the account can be from this user, stop paging there
+                async for msg in channel_history(channel, limit, after=user.created_at):
                     # Check for cancellation
-                    if search_cancelled:
+                    if cancel_event.is_set():
                         break
 
+                    total_searched += 1
+
                     # Check if message is from target user and contains keyword
-                    if msg.author.id == user.id and keyword.lower() in msg.content.lower():
+                    if msg.author.id == user.id and keyword_re.search(msg.content):
                         found_messages.append(msg)
 
             except discord.Forbidden:
-                continue
+                return
             except Exception as e:
                 await ctx.send(f"⚠️ Error searching channel {channel.name}: {e}")
-                continue
+
+        def render_status():
+            return format_search_status(channels_searched, total_channels, total_searched,
+                                        len(found_messages), start_time, cancel_event.is_set())
+
+        # Progress edits happen in the background so the search never waits on them
+        status_task = bot.loop.create_task(update_status_periodically(status_msg, render_status))
+        try:
+            # Search channels concurrently with a bounded number of open history cursors
+            await scan_channels_concurrently(search_channels, search_channel)
+        finally:
+            await stop_status_updates(status_task)
+
+        if cancel_event.is_set():
+            await status_msg.edit(content=f"⚠️ Search cancelled after checking {channels_searched}/{total_channels} channels.")
+            return
 
         # Calculate search time
-        search_time = (datetime.now() - start_time).total_seconds()
+        search_time = time.monotonic() - start_time
 
         if not found_messages:
             await status_msg.edit(content=f"✅ Search complete! No messages found from {user.name} containing '{keyword}' (searched {total_searched:,} messages in {search_time:.1f}s)")
         else:
             # Format results
-            result_text = f"✅ Found {len(found_messages)} messages from {user.name} containing '{keyword}' (searched {total_searched:,} messages in {search_time:.1f}s)"
+            result_lines = [
+                f"✅ Found {len(found_messages)} messages from {user.name} containing '{keyword}' (searched {total_searched:,} messages in {search_time:.1f}s)",
+                "Latest messages:"
+            ]
 
             # List first few results
-            result_text += "\nLatest messages:"
-            count = 0
-            for msg in sorted(found_messages, key=lambda m: m.created_at, reverse=True):
-                if count < 5:  # Show at most 5 messages
-                    channel_name = msg.channel.name
+            sorted_messages = sorted(found_messages, key=lambda m: m.created_at, reverse=True)
+            for msg in sorted_messages[:5]:  # Show at most 5 messages
+                channel_name = msg.channel.name
+                date = f"<t:{int(msg.created_at.timestamp())}:f>"  # Rendered by the Discord client in the reader's timezone
+                result_lines.append(f"- {date} #{channel_name}: {msg.content[:100]}{'...' if len(msg.content) > 100 else ''}")
+
+            result_lines.append(f"\nUse `!export {user.id} {keyword}` to export all messages.")
+
+            if len(found_messages) > 5:
+                # Attach every result as a file instead of losing them to the message length limit
+                report_lines = []
+                for msg in sorted_messages:
                     date = msg.created_at.strftime('%Y-%m-%d %H:%M:%S')
-                    result_text += f"\n- {date} #{channel_name}: {msg.content[:100]}{'...' if len(msg.content) > 100 else ''}"
-                    count += 1
-                else:
-                    break
-
-            result_text += f"\n\nUse `!export {user.id} {keyword}` to export all messages."
-            await status_msg.edit(content=result_text[:2000])  # Discord message limit
+                    report_lines.append(f"{date} #{msg.channel.name} {msg.jump_url}\n{msg.content}\n")
+                report = discord.File(io.BytesIO("\n".join(report_lines).encode("utf-8")), filename="search.txt")
+                result_lines.append(f"All {len(found_messages)} results are attached.")
+                await status_msg.edit(content="\n".join(result_lines)[:2000], attachments=[report])
+            else:
+                await status_msg.edit(content="\n".join(result_lines)[:2000])  # Discord message limit
 
         # Update search statistics
         update_search_stats(search_stats, ctx, total_searched, found_messages, search_time)
@@ -826,7 +1127,6 @@ async def search_messages(ctx, *args):
 
     finally:
         search_messages.is_running = False
-        search_cancelled = False
 
 
 # Handle cooldown error
@@ -846,8 +1146,8 @@ def load_search_stats():
     """Load search statistics from file if it exists"""
     try:
         if os.path.exists(STATS_FILE):
-            with open(STATS_FILE, 'r', encoding='utf-8') as f:
-                loaded_stats = json.load(f)
+            with open(STATS_FILE, 'rb') as f:
+                loaded_stats = orjson.loads(f.read())
                 return loaded_stats
         else:
             # Return default stats structure if file doesn't exist
@@ -884,13 +1184,47 @@ def load_search_stats():
 search_stats = load_search_stats()
 
 
+# Set when search_stats changed since the last write to disk
+search_stats_dirty = False
+
+
 def save_search_stats():
-    """Save current search statistics to file"""
+    """Mark search statistics as changed, they are written to disk by flush_search_stats"""
+    global search_stats_dirty
+    search_stats_dirty = True
+
+
+def write_search_stats(data):
+    """Atomically replace the stats file with already serialized data, returning whether it worked"""
     try:
-        with open(STATS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(search_stats, f, indent=2)
+        tmp_file = f"{STATS_FILE}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, STATS_FILE)
+        return True
     except Exception as e:
         print(f"Error saving search stats: {e}")
+        return False
+
+
+@tasks.loop(seconds=30)
+async def flush_search_stats():
+    """Write search statistics to disk at most every 30 seconds when they changed"""
+    global search_stats_dirty
+    if search_stats_dirty:
+        search_stats_dirty = False
+        # Serialize on the event loop so the dict can't change mid-dump, then write off the loop
+        data = orjson.dumps(search_stats, option=orjson.OPT_INDENT_2)
+        # Keep the stats dirty when the write fails so the next pass retries it
+        if not await bot.loop.run_in_executor(None, write_search_stats, data):
+            search_stats_dirty = True
+
+
+@atexit.register
+def flush_search_stats_on_exit():
+    """Write pending search statistics on shutdown"""
+    if search_stats_dirty:
+        write_search_stats(orjson.dumps(search_stats, option=orjson.OPT_INDENT_2))
 
 
 @bot.command(name="searchstats")
@@ -979,58 +1313,47 @@ async def search_stats_command(ctx):
 
     await ctx.send(embed=embed)
 
-    # Save stats to ensure they're synced with file
-    save_search_stats()
-
-
-@bot.command(name="context")
-async def get_context(ctx, message_id: int = None, lines: int = 5):
-    """Get context around a specific message"""
-    if not is_admin(ctx):
-        return await ctx.send("❌ You must be a server admin to use this.")
-
-    # Check for required message ID
-    if message_id is None:
-        return await ctx.send("⚠️ Usage: `!context message_id [lines=5]`\nYou must provide a message ID to get context.")
-
-    # Validate lines parameter
-    if lines < 1:
-        lines = 1
-    elif lines > 15:  # Limit to reasonable number
-        lines = 15
-        await ctx.send("⚠️ Maximum context limited to 15 messages.")
-
-    # Status message
-    status_msg = await ctx.send(f"🔍 Searching for message {message_id} and retrieving {lines} messages of context...")
 
+async def build_context(guild, message_id, lines):
+    """Find a message and render the messages around it, returning None if it can't be found"""
     # Find the message across all channels
     target_message = None
     target_channel = None
 
-    for channel in ctx.guild.text_channels:
+    # Try the channel recorded when the message was received first
+    known_channel = guild.get_channel(recent_msg_channel.get(message_id, 0))
+    if known_channel:
         try:
-            # First check cached messages to avoid unnecessary API calls
-            messages = await get_cached_messages(channel.id, limit=100)
-            for msg in messages:
-                if msg.id == message_id:
-                    target_message = msg
-                    target_channel = channel
-                    break
+            target_message = await known_channel.fetch_message(message_id)
+            target_channel = known_channel
+        except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+            target_message = None
 
-            if target_message:
-                break
+    if not target_message:
+        for channel in guild.text_channels:
+            try:
+                # First check cached messages to avoid unnecessary API calls
+                messages = await get_cached_messages(channel.id, limit=100)
+                for msg in messages:
+                    if msg.id == message_id:
+                        target_message = msg
+                        target_channel = channel
+                        break
 
-            # If not found in cache, try to fetch directly
-            target_message = await channel.fetch_message(message_id)
-            if target_message:
-                target_channel = channel
-                break
-        except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-            # Message not in this channel or can't access
-            continue
+                if target_message:
+                    break
+
+                # If not found in cache, try to fetch directly
+                target_message = await channel.fetch_message(message_id)
+                if target_message:
+                    target_channel = channel
+                    break
+            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+                # Message not in this channel or can't access
+                continue
 
     if not target_message:
-        return await status_msg.edit(content=f"❌ Message with ID {message_id} not found in any channel.")
+        return None
 
     # Calculate how many messages to get before and after
     before_count = lines // 2
@@ -1057,53 +1380,36 @@ async def get_context(ctx, message_id: int = None, lines: int = 5):
 
     # If we couldn't get enough context from cache, fall back to API
     if not context_messages:
-        # Get messages before target
-        try:
+        async def fetch_before():
+            """Get messages before target, oldest first"""
             before_msgs = []
-            async for msg in target_channel.history(limit=before_count, before=target_message):
-                before_msgs.append(msg)
+            try:
+                async for msg in target_channel.history(limit=before_count, before=target_message):
+                    before_msgs.append(msg)
+            except discord.HTTPException:
+                pass
             # Reverse order to show oldest first
             before_msgs.reverse()
-            context_messages.extend(before_msgs)
-        except discord.HTTPException:
-            pass
+            return before_msgs
 
-        # Add target message
-        context_messages.append(target_message)
-
-        # Get messages after target
-        try:
+        async def fetch_after():
+            """Get messages after target"""
             after_msgs = []
-            async for msg in target_channel.history(limit=after_count, after=target_message):
-                after_msgs.append(msg)
-            context_messages.extend(after_msgs)
-        except discord.HTTPException:
-            pass
-
-    # Add target message
-    context_messages.append(target_message)
+            try:
+                async for msg in target_channel.history(limit=after_count, after=target_message):
+                    after_msgs.append(msg)
+            except discord.HTTPException:
+                pass
+            return after_msgs
 
-    # Get messages after target
-    try:
-        # Fix: Convert async generator to list manually instead of using flatten()
-        after_msgs = []
-        async for msg in target_channel.history(limit=after_count, after=target_message):
-            after_msgs.append(msg)
-        context_messages.extend(after_msgs)
-    except discord.HTTPException:
-        pass
-
-    # Create the embed for displaying context
-    embed = discord.Embed(
-        title=f"Message Context in #{target_channel.name}",
-        color=0x3498db,
-        description=f"Context around [message]({target_message.jump_url}) from {target_message.author.name}"
-    )
+        # The two history requests are independent, so run them at the same time
+        before_msgs, after_msgs = await asyncio.gather(fetch_before(), fetch_after())
+        context_messages = before_msgs + [target_message] + after_msgs
 
     # Format the messages
-    context_content = ""
+    context_parts = []
     for i, msg in enumerate(context_messages):
-        timestamp = msg.created_at.strftime('%H:%M:%S')
+        timestamp = f"<t:{int(msg.created_at.timestamp())}:T>"
         is_target = msg.id == message_id
 
         # Format the message differently if it's the target message
@@ -1116,18 +1422,79 @@ async def get_context(ctx, message_id: int = None, lines: int = 5):
         content = msg.content if len(msg.content) <= 300 else f"{msg.content[:297]}..."
 
         # Add message to context string
-        context_content += f"[{timestamp}] {author_part}: {content}\n"
+        context_parts.append(f"[{timestamp}] {author_part}: {content}\n")
 
         # Add attachments if any
         if msg.attachments:
             attachment_list = ", ".join([f"[{a.filename}]({a.url})" for a in msg.attachments])
-            context_content += f"📎 {attachment_list}\n"
+            context_parts.append(f"📎 {attachment_list}\n")
 
         # Add message separator
-        context_content += "\n"
+        context_parts.append("\n")
+
+    context_content = "".join(context_parts)
+
+    return {
+        "channel_id": target_channel.id,
+        "channel_name": target_channel.name,
+        "jump_url": target_message.jump_url,
+        "author": target_message.author.name,
+        "content": context_content
+    }
+
+
+def forget_context(channel_id):
+    """Drop cached !context results for a channel after its messages changed"""
+    keys = context_keys_by_channel.pop(channel_id, None)
+    if keys:
+        for key in keys:
+            context_cache.pop(key, None)
+
+
+def remember_context(cache_key, context):
+    """Cache a rendered !context result and index it by channel for forget_context"""
+    context_cache[cache_key] = context
+    keys = context_keys_by_channel[context["channel_id"]]
+    # Drop keys whose entries already expired so the index stays as small as the cache
+    keys.difference_update([key for key in keys if key not in context_cache])
+    keys.add(cache_key)
+
 
-    # Add context to embed
-    embed.description = f"Context around [message]({target_message.jump_url}) from {target_message.author.name}\n\n{context_content}"
+@bot.command(name="context")
+async def get_context(ctx, message_id: int = None, lines: int = 5):
+    """Get context around a specific message"""
+    if not is_admin(ctx):
+        return await ctx.send("❌ You must be a server admin to use this.")
+
+    # Check for required message ID
+    if message_id is None:
+        return await ctx.send("⚠️ Usage: `!context message_id [lines=5]`\nYou must provide a message ID to get context.")
+
+    # Validate lines parameter
+    if lines < 1:
+        lines = 1
+    elif lines > 15:  # Limit to reasonable number
+        lines = 15
+        await ctx.send("⚠️ Maximum context limited to 15 messages.")
+
+    # Status message
+    status_msg = await ctx.send(f"🔍 Searching for message {message_id} and retrieving {lines} messages of context...")
+
+    # Reuse the rendered context when the same message was looked up recently
+    cache_key = (ctx.guild.id, message_id, lines)
+    context = context_cache.get(cache_key)
+    if context is None:
+        context = await build_context(ctx.guild, message_id, lines)
+        if context is None:
+            return await status_msg.edit(content=f"❌ Message with ID {message_id} not found in any channel.")
+        remember_context(cache_key, context)
+
+    # Create the embed for displaying context
+    embed = discord.Embed(
+        title=f"Message Context in #{context['channel_name']}",
+        color=0x3498db,
+        description=f"Context around [message]({context['jump_url']}) from {context['author']}\n\n{context['content']}"
+    )
 
     # Add footer with navigation help
     embed.set_footer(text=f"Use !context {message_id} [lines] to adjust context size")
@@ -1135,7 +1502,7 @@ async def get_context(ctx, message_id: int = None, lines: int = 5):
     await status_msg.edit(content=None, embed=embed)
 
     # Add direct jump link as a separate message for easy clicking
-    await ctx.send(f"🔗 **Direct link to message:** {target_message.jump_url}")
+    await ctx.send(f"🔗 **Direct link to message:** {context['jump_url']}")
 
 
 @bot.command(name="regex", aliases=["regexsearch", "regexsearcher", "regsea", "rs", "rsearch", "reg"])
@@ -1202,23 +1569,17 @@ async def regex_search(ctx, *args):
 
     # Compile regex pattern
     try:
-        pattern = re.compile(regex_pattern, re.IGNORECASE)
+        pattern = compile_pattern(regex_pattern, re.IGNORECASE)
     except re.error as e:
         return await ctx.send(f"⚠️ Invalid regex pattern: {e}")
 
     # Check cooldown for deep searches
     if deep_search or custom_query:
         search_stats["deep_searches"] += 1
-        guild_id = ctx.guild.id
-        current_time = datetime.now()
-        if guild_id in search_cooldowns:
-            time_diff = (current_time - search_cooldowns[guild_id]).total_seconds()
-            if time_diff < 600:  # 10 minutes cooldown
-                remaining = int(600 - time_diff)
-                minutes = remaining // 60
-                seconds = remaining % 60
-                return await ctx.send(f"⚠️ Deep search cooldown! Please wait {minutes}m {seconds}s before running another deep search.")
-        search_cooldowns[guild_id] = current_time
+    cooldown_ok, remaining = apply_cooldown(search_cooldowns, ctx, deep_search, custom_query, cooldown_minutes=10)
+    if not cooldown_ok:
+        minutes, seconds = divmod(int(remaining * 60), 60)
+        return await ctx.send(f"⚠️ Deep search cooldown! Please wait {minutes}m {seconds}s before running another deep search.")
 
     regex_search.is_running = True
 
@@ -1256,66 +1617,77 @@ async def regex_search(ctx, *args):
                     search_channels.append(channel)
         else:
             if exclude_channels:
-                exclude_ch_names = [ch.strip('#') for ch in exclude_channels]
+                exclude_ch_names = {ch.strip('#') for ch in exclude_channels}
                 search_channels = [ch for ch in ctx.guild.text_channels
                                    if ch.name not in exclude_ch_names]
             else:
                 search_channels = ctx.guild.text_channels
 
         total_channels = len(search_channels)
-        found_messages = []
         total_searched = 0
-        start_time = datetime.now()
-        last_update_time = start_time
+        start_time = time.monotonic()
         channels_searched = 0
+        target_id = user.id
 
-        # Search through channels
-        for channel in search_channels:
-            channels_searched += 1
+        async def search_channel(channel):
+            """Return the target user's messages matching the pattern in one channel"""
+            nonlocal total_searched, channels_searched
 
             # Check if search was cancelled
             if search_cancelled:
-                await status_msg.edit(content="⚠️ Search cancelled.")
-                search_stats["cancelled_searches"] += 1
-                return
+                return []
 
-            try:
-                messages = await get_cached_messages(channel.id, limit=query_limit, force_refresh=deep_search)
-                for msg in messages:
-                    if msg.author.id == user.id and pattern.search(msg.content):
-                        found_messages.append((msg, channel))
-                    total_searched += 1
+            channels_searched += 1
+            messages = await get_cached_messages(channel.id, limit=query_limit, force_refresh=deep_search)
 
-                    # Update status message every 30 seconds to show progress
-                    current_time = datetime.now()
-                    if (current_time - last_update_time).total_seconds() > 30:
-                        progress = int(channels_searched / total_channels * 100)
-                        await status_msg.edit(content=f"🔍 {'Deep ' if deep_search else ''}searching {search_msg_prefix}for messages from {user.name} matching `{regex_pattern}`... {progress}% ({channels_searched}/{total_channels} channels, {total_searched:,} messages checked)")
-                        last_update_time = current_time
+            # Only run the pattern on the target user's messages, the rest cost a single ID comparison
+            matches = [msg for msg in messages if msg.author.id == target_id and pattern.search(msg.content)]
+            total_searched += len(messages)
+            return matches
 
-            except discord.Forbidden:
-                continue
+        def render_status():
+            progress = int(channels_searched / total_channels * 100) if total_channels else 100
+            return f"🔍 {'Deep ' if deep_search else ''}searching {search_msg_prefix}for messages from {user.name} matching `{regex_pattern}`... {progress}% ({channels_searched}/{total_channels} channels, {total_searched:,} messages checked)"
+
+        # Update status message every 30 seconds in the background, channel scans never wait on it
+        status_task = bot.loop.create_task(update_status_periodically(status_msg, render_status, interval=30))
+        try:
+            # Search channels concurrently, channels we can't read are skipped
+            results = await scan_channels_concurrently(search_channels, search_channel)
+        finally:
+            await stop_status_updates(status_task)
+
+        if search_cancelled:
+            await status_msg.edit(content="⚠️ Search cancelled.")
+            search_stats["cancelled_searches"] += 1
+            return
+
+        found_messages = [(msg, channel) for channel, matches in results for msg in matches]
 
         # Calculate search time
-        search_time = (datetime.now() - start_time).total_seconds()
+        search_time = time.monotonic() - start_time
 
         if not found_messages:
             await status_msg.edit(
                 content=f"❌ No messages found from {user.name} matching '{regex_pattern}'. Searched {total_searched:,} messages in {search_time:.1f}s."
             )
         else:
-            # Format results
-            result = f"✅ Found {len(found_messages)} regex matches for pattern `{regex_pattern}` from {user.name} (searched {total_searched:,} messages in {search_time:.1f}s):\n\n"
+            # Format results, collecting parts and joining them once per sent message
+            parts = [f"✅ Found {len(found_messages)} regex matches for pattern `{regex_pattern}` from {user.name} (searched {total_searched:,} messages in {search_time:.1f}s):\n\n"]
+            length = len(parts[0])
 
             for i, (msg, channel) in enumerate(found_messages, 1):
-                timestamp = msg.created_at.strftime('%Y-%m-%d %H:%M:%S')
+                timestamp = f"<t:{int(msg.created_at.timestamp())}:f>"
                 content = msg.content if len(msg.content) <= 500 else f"{msg.content[:497]}..."
-                result += f"{i}. **#{channel.name}** ({timestamp}):\n{content}\n[Jump to message]({msg.jump_url})\n\n"
-                if len(result) > 1800:
-                    await ctx.send(result)
-                    result = ""
-            if result:
-                await ctx.send(result)
+                part = f"{i}. **#{channel.name}** ({timestamp}):\n{content}\n[Jump to message]({msg.jump_url})\n\n"
+                parts.append(part)
+                length += len(part)
+                if length > 1800:
+                    await ctx.send("".join(parts))
+                    parts = []
+                    length = 0
+            if parts:
+                await ctx.send("".join(parts))
             await status_msg.edit(content=f"✅ Found {len(found_messages)} messages from {user.name} matching '{regex_pattern}'.")
 
         # Update global search stats
@@ -1324,17 +1696,9 @@ async def regex_search(ctx, *args):
         search_stats["total_matches_found"] += len(found_messages)
         search_stats["search_time_total"] += search_time
 
-        # Update guild stats
-        guild_name = ctx.guild.name
-        if guild_name not in search_stats["searches_by_guild"]:
-            search_stats["searches_by_guild"][guild_name] = 0
-        search_stats["searches_by_guild"][guild_name] += 1
-
-        # Update user stats
-        user_name = f"{ctx.author.name}"
-        if user_name not in search_stats["searches_by_user"]:
-            search_stats["searches_by_user"][user_name] = 0
-        search_stats["searches_by_user"][user_name] += 1
+        # Update guild and user stats
+        count_search(search_stats["searches_by_guild"], ctx.guild.name)
+        count_search(search_stats["searches_by_user"], ctx.author.name)
 
         # Update last search data
         search_stats["last_search"] = {
@@ -1430,18 +1794,10 @@ async def export_results(ctx, *args):
     filename = f"exports/{user.name}_{keyword.replace(' ', '_')[:20]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
 
     # Apply cooldown check for deep searches
-    if deep_search or custom_query:
-        # Same cooldown logic as in search_messages
-        guild_id = ctx.guild.id
-        current_time = datetime.now()
-        if guild_id in search_cooldowns:
-            time_diff = (current_time - search_cooldowns[guild_id]).total_seconds()
-            if time_diff < 600:  # 10 minutes cooldown
-                remaining = int(600 - time_diff)
-                minutes = remaining // 60
-                seconds = remaining % 60
-                return await ctx.send(f"⚠️ Deep search cooldown! Please wait {minutes}m {seconds}s before running another deep search.")
-        search_cooldowns[guild_id] = current_time
+    cooldown_ok, remaining = apply_cooldown(search_cooldowns, ctx, deep_search, custom_query, cooldown_minutes=10)
+    if not cooldown_ok:
+        minutes, seconds = divmod(int(remaining * 60), 60)
+        return await ctx.send(f"⚠️ Deep search cooldown! Please wait {minutes}m {seconds}s before running another deep search.")
 
     # Fix: Capitalize first letter when not deep searching
     searching_text = "Searching" if not deep_search else "Deep searching"
@@ -1462,85 +1818,98 @@ async def export_results(ctx, *args):
                     search_channels.append(channel)
         else:
             if exclude_channels:
-                exclude_ch_names = [ch.strip('#') for ch in exclude_channels]
+                exclude_ch_names = {ch.strip('#') for ch in exclude_channels}
                 search_channels = [ch for ch in ctx.guild.text_channels
                                   if ch.name not in exclude_ch_names]
             else:
                 search_channels = ctx.guild.text_channels
 
-        found_messages = []
         total_searched = 0
-        start_time = datetime.now()
-        last_update_time = start_time
+        start_time = time.monotonic()
         channels_searched = 0
 
-        # Search through channels
-        for channel in search_channels:
-            channels_searched += 1
+        # Use the specified limit for deep searches and the default one otherwise
+        limit = query_limit if deep_search or custom_query else 100
+
+        # Case-insensitive pattern avoids lowercasing every message
+        keyword_re = compile_pattern(re.escape(keyword), re.IGNORECASE)
+        target_id = user.id
+
+        async def export_channel(channel):
+            """Return the target user's messages containing the keyword in one channel"""
+            nonlocal total_searched, channels_searched
 
             # Check if search was cancelled
             if search_cancelled:
-                await status_msg.edit(content=f"⚠️ Export cancelled after searching {total_searched:,} messages.")
-                return
+                return []
 
-            # Update status message every 5 seconds
-            current_time = datetime.now()
-            if (current_time - last_update_time).total_seconds() > 5:
-                progress = channels_searched / len(search_channels) * 100
-                time_elapsed = (current_time - start_time).total_seconds()
-                await status_msg.edit(content=f"🔍 {searching_text}... ({channels_searched}/{len(search_channels)} channels, {total_searched:,} messages, {progress:.1f}%, {time_elapsed:.1f}s)")
-                last_update_time = current_time
+            channels_searched += 1
+            matches = []
+            # Nothing older than the account can be from this user, stop paging there
+            async for msg in channel_history(channel, limit, after=user.created_at):
+                # Stop within the current page instead of finishing the channel
+                if search_cancelled:
+                    break
 
-            try:
-                messages = []
-                if deep_search or custom_query:
-                    # Use specified limit for deep searches
-                    async for msg in channel.history(limit=query_limit):
-                        messages.append(msg)
-                        total_searched += 1
-                else:
-                    # Use default limit for regular searches
-                    async for msg in channel.history(limit=100):
-                        messages.append(msg)
-                        total_searched += 1
+                total_searched += 1
+                # Skip other authors before touching the content
+                if msg.author.id != target_id:
+                    continue
+                if keyword_re.search(msg.content):
+                    matches.append(msg)
+            return matches
 
-                # Search messages
-                for msg in messages:
-                    if msg.author.id == user.id and keyword.lower() in msg.content.lower():
-                        found_messages.append((msg, channel))
+        def render_status():
+            progress = channels_searched / len(search_channels) * 100 if search_channels else 100
+            time_elapsed = time.monotonic() - start_time
+            return f"🔍 {searching_text}... ({channels_searched}/{len(search_channels)} channels, {total_searched:,} messages, {progress:.1f}%, {time_elapsed:.1f}s)"
 
-            except discord.Forbidden:
-                continue
+        # Update status message every 5 seconds in the background so the export never waits on an edit
+        status_task = bot.loop.create_task(update_status_periodically(status_msg, render_status))
+        try:
+            # Search channels concurrently, channels we can't read are skipped
+            results = await scan_channels_concurrently(search_channels, export_channel)
+        finally:
+            await stop_status_updates(status_task)
+
+        if search_cancelled:
+            await status_msg.edit(content=f"⚠️ Export cancelled after searching {total_searched:,} messages.")
+            return
+
+        found_messages = [(msg, channel) for channel, matches in results for msg in matches]
 
         # Calculate search time
-        search_time = (datetime.now() - start_time).total_seconds()
-
-        # Export results to file
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"Export of messages from {user.name} containing '{keyword}'\n")
-            f.write(f"Searched {total_searched:,} messages in {search_time:.1f}s\n")
-            f.write(f"Found {len(found_messages)} matching messages\n")
-            f.write(f"Export date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
-
-            if not found_messages:
-                f.write("No matching messages found.")
-            else:
-                for i, (msg, channel) in enumerate(found_messages, 1):
-                    timestamp = msg.created_at.strftime('%Y-%m-%d %H:%M:%S')
-                    f.write(f"Message {i}/{len(found_messages)}\n")
-                    f.write(f"Channel: #{channel.name}\n")
-                    f.write(f"Date: {timestamp}\n")
-                    f.write(f"Link: {msg.jump_url}\n")
-                    f.write(f"Content: {msg.content}\n")
-
-                    # Add attachments info
-                    if msg.attachments:
-                        f.write("Attachments:\n")
-                        for a in msg.attachments:
-                            f.write(f"  - {a.filename}: {a.url}\n")
-
-                    f.write("\n" + "-" * 40 + "\n\n")
+        search_time = time.monotonic() - start_time
+
+        # Build the export in memory and write it in one go off the event loop
+        lines = [
+            f"Export of messages from {user.name} containing '{keyword}'\n",
+            f"Searched {total_searched:,} messages in {search_time:.1f}s\n",
+            f"Found {len(found_messages)} matching messages\n",
+            f"Export date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            "=" * 80 + "\n\n"
+        ]
+
+        if not found_messages:
+            lines.append("No matching messages found.")
+        else:
+            for i, (msg, channel) in enumerate(found_messages, 1):
+                timestamp = msg.created_at.strftime('%Y-%m-%d %H:%M:%S')
+                lines.append(f"Message {i}/{len(found_messages)}\n")
+                lines.append(f"Channel: #{channel.name}\n")
+                lines.append(f"Date: {timestamp}\n")
+                lines.append(f"Link: {msg.jump_url}\n")
+                lines.append(f"Content: {msg.content}\n")
+
+                # Add attachments info
+                if msg.attachments:
+                    lines.append("Attachments:\n")
+                    for a in msg.attachments:
+                        lines.append(f"  - {a.filename}: {a.url}\n")
+
+                lines.append("\n" + "-" * 40 + "\n\n")
+
+        await bot.loop.run_in_executor(None, write_export_file, filename, "".join(lines))
 
         # Update status and send file
         await status_msg.edit(content=f"✅ Export complete! Found {len(found_messages)} messages from {user.name} containing '{keyword}' (searched {total_searched:,} messages in {search_time:.1f}s)")
@@ -1555,17 +1924,9 @@ async def export_results(ctx, *args):
         search_stats["total_matches_found"] += len(found_messages)
         search_stats["search_time_total"] += search_time
 
-        # Update guild stats
-        guild_name = ctx.guild.name
-        if guild_name not in search_stats["searches_by_guild"]:
-            search_stats["searches_by_guild"][guild_name] = 0
-        search_stats["searches_by_guild"][guild_name] += 1
-
-        # Update user stats
-        user_name = f"{ctx.author.name}"
-        if user_name not in search_stats["searches_by_user"]:
-            search_stats["searches_by_user"][user_name] = 0
-        search_stats["searches_by_user"][user_name] += 1
+        # Update guild and user stats
+        count_search(search_stats["searches_by_guild"], ctx.guild.name)
+        count_search(search_stats["searches_by_user"], ctx.author.name)
 
         # Update last search data
         search_stats["last_search"] = {
@@ -1595,10 +1956,8 @@ async def export_results(ctx, *args):
         search_cancelled = False
 
 
-@bot.command(name="help")
-async def help_command(ctx):
-    if not is_admin(ctx):
-        return
+def build_help_embed():
+    """Build the !help embed, its content never changes so it's only built once"""
     embed = discord.Embed(
         title="🛠️ Bot Commands",
         color=0x3498db,
@@ -1633,38 +1992,100 @@ async def help_command(ctx):
     embed.add_field(name="!autoscan on/off", value="Enable/disable periodic auto-scanning", inline=False)
     embed.add_field(name="!scaninterval <minutes>", value="Set auto-scan interval in minutes", inline=False)
     embed.add_field(name="!clearlogs today/all", value="Delete logs for today or all logs", inline=False)
-    await ctx.send(embed=embed)
+    return embed
+
+
+HELP_EMBED = build_help_embed()
+
+
+@bot.command(name="help")
+async def help_command(ctx):
+    if not is_admin(ctx):
+        return
+    await ctx.send(embed=HELP_EMBED)
 
 
 # --- Scheduled tasks ---
+AUTO_SCAN_STATE_FILE = "auto_scan_state.json"
+
+
+def load_auto_scan_last_seen():
+    """Load the newest message ID auto-scan checked in each channel, saved by the previous run"""
+    try:
+        if os.path.exists(AUTO_SCAN_STATE_FILE):
+            with open(AUTO_SCAN_STATE_FILE, 'rb') as f:
+                # JSON object keys are strings, channel IDs are ints
+                return {int(channel_id): msg_id for channel_id, msg_id in orjson.loads(f.read()).items()}
+    except Exception as e:
+        print(f"Error loading auto-scan state: {e}")
+    return {}
+
+
+# Channel ID -> newest message ID checked by auto-scan, so each run only fetches newer messages
+auto_scan_last_seen = load_auto_scan_last_seen()
+
+
+@atexit.register
+def save_auto_scan_last_seen():
+    """Atomically write the auto-scan positions on shutdown, so a restart doesn't log the same matches again"""
+    if not auto_scan_last_seen:
+        return
+    try:
+        tmp_file = f"{AUTO_SCAN_STATE_FILE}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(auto_scan_last_seen, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_file, AUTO_SCAN_STATE_FILE)
+    except Exception as e:
+        print(f"Error saving auto-scan state: {e}")
+
+
 @tasks.loop(seconds=3600)
 async def auto_scan():
     print(f"🔄 Running scheduled auto-scan ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})")
 
     scan_count = 0
-    message_count = 0
 
-    for guild in bot.guilds:
-        if not guild.chunked:
-            await guild.chunk(cache=True)
+    # Chunk the guilds that need it concurrently rather than one after another
+    await asyncio.gather(*(guild.chunk(cache=True) for guild in bot.guilds if not guild.chunked),
+                         return_exceptions=True)
 
-        for member in get_cached_members(guild.id):
-            name_fields = f"{member.name} {member.display_name}"
+    for guild in bot.guilds:
+        for member_id, name_fields in get_cached_members(guild.id).items():
             if keyword_match(name_fields):
-                entry = f"[AUTO-SCAN] {member} ({member.id}) in {guild.name}"
+                member = guild.get_member(member_id) or member_id
+                entry = f"[AUTO-SCAN] {member} ({member_id}) in {guild.name}"
                 user_logger.info(entry)
                 scan_count += 1
 
-        for channel in guild.text_channels:
-            try:
-                messages = await get_cached_messages(channel.id, limit=100, force_refresh=True)
-                for msg in messages:
-                    if keyword_match(msg.content):
-                        entry = f"[AUTO-SCAN] {msg.author} in #{channel.name} ({msg.guild.name}) > {msg.content}"
-                        msg_logger.info(entry)
-                        message_count += 1
-            except discord.Forbidden:
-                continue
+    async def scan_channel(channel):
+        """Check the messages posted in a channel since its last auto-scan and return the match count"""
+        matches = 0
+
+        # Only ask for the messages posted since the previous auto-scan of this channel
+        last_seen = auto_scan_last_seen.get(channel.id)
+        if last_seen:
+            history = channel.history(limit=100, after=discord.Object(id=last_seen), oldest_first=True)
+        else:
+            history = channel.history(limit=100)
+
+        # A failing channel keeps the matches found so far instead of dropping the whole run
+        try:
+            async for msg in history:
+                if msg.id > auto_scan_last_seen.get(channel.id, 0):
+                    auto_scan_last_seen[channel.id] = msg.id
+                if keyword_match(msg.content):
+                    entry = f"[AUTO-SCAN] {msg.author} in #{channel.name} ({msg.guild.name}) > {msg.content}"
+                    msg_logger.info(entry)
+                    matches += 1
+        except discord.HTTPException as e:
+            print(f"⚠️ Auto-scan failed for #{channel.name} ({channel.guild.name}): {e}")
+        return matches
+
+    # Scan every readable channel of every guild with bounded concurrency
+    channels = [channel for guild in bot.guilds for channel in guild.text_channels
+                if can_read_history(channel, guild.me)]
+    results = await scan_channels_concurrently(channels, scan_channel)
+    message_count = sum(matches for _, matches in results)
 
     next_scan_time = datetime.now() + timedelta(seconds=auto_scan.seconds)
     next_scan_str = next_scan_time.strftime('%Y-%m-%d %H:%M:%S')
@@ -1736,31 +2157,39 @@ async def clear_logs(ctx, scope: str = "today"):
     if not is_admin(ctx):
         return await ctx.send("❌ You must be a server admin to use this.")
 
+    if scope.lower() == "today":
+        # Log folders are named YYYY-MM-DD_HH, so today's folders share the date prefix
+        folder_prefix = datetime.now().strftime('%Y-%m-%d')
+    elif scope.lower() == "all":
+        folder_prefix = ""
+    else:
+        return await ctx.send("⚠️ Invalid scope. Use 'today' or 'all'.")
+
     try:
-        global msg_logger, user_logger, msg_log_path, user_log_path, log_listener
+        status_msg = await ctx.send("🗑️ Clearing logs...")
 
-        # Stop the current listener
+        # Stop the current listener and release the open log files so they can be deleted
         log_listener.stop()
+        msg_handler.close()
+        user_handler.close()
 
-        if scope.lower() == "today":
-            # Clear today's logs
-            with open(msg_log_path, 'w', encoding='utf-8') as f:
-                pass
-            with open(user_log_path, 'w', encoding='utf-8') as f:
-                pass
-            await ctx.send("✅ Today's logs cleared successfully.")
+        # Delete in a worker thread and report progress by editing one message
+        counter = DeleteCounter()
+        monitor_task = bot.loop.create_task(update_delete_progress(status_msg, counter))
+        try:
+            removed = await bot.loop.run_in_executor(None, clear_log_folders, LOGS_DIR_B, folder_prefix, counter)
+        finally:
+            await stop_status_updates(monitor_task)
 
-        elif scope.lower() == "all":
-            # Delete all log directories and files
-            shutil.rmtree(LOGS_DIR)
-            os.makedirs(LOGS_DIR, exist_ok=True)
-            await ctx.send("✅ All logs cleared successfully.")
+            # Reuse the existing handlers, only their target files change
+            msg_handler.reopen()
+            user_handler.reopen()
+            log_listener.start()
 
+        if folder_prefix:
+            await status_msg.edit(content=f"✅ Today's logs cleared successfully ({removed} files deleted).")
         else:
-            await ctx.send("⚠️ Invalid scope. Use 'today' or 'all'.")
-
-        # Re-initialize logging
-        msg_logger, user_logger, msg_log_path, user_log_path, log_listener = setup_logging()
+            await status_msg.edit(content=f"✅ All logs cleared successfully ({removed} files deleted).")
 
     except Exception as e:
         await ctx.send(f"❌ Error clearing logs: {str(e)}")
@@ -1822,33 +2251,11 @@ async def scan_bad_words(ctx, *args):
     # Extract flags with default values
     query_limit = int(flags.get("query_limit", 500))  # Default limit
 
-    # Handle channel filters directly from args to ensure proper parsing
-    include_channels = []
-
-    # Process --in flag for channels
-    for i, arg in enumerate(args):
-        if arg == "--in" and i + 1 < len(args):
-            channel_input = args[i + 1]
-            include_channels.append(channel_input)
-        elif arg.startswith("--in="):
-            channel_input = arg[5:]
-            include_channels.append(channel_input)
-
-    # Process strictness flag
-    strictness = "medium"  # default
-    for i, arg in enumerate(args):
-        if arg.startswith("--strictness="):
-            strictness = arg[13:]
-        elif arg == "--strictness" and i + 1 < len(args):
-            strictness = args[i + 1]
-
-    # Process language flag
-    lang = "en"  # default
-    for i, arg in enumerate(args):
-        if arg.startswith("--lang="):
-            lang = arg[7:]
-        elif arg == "--lang" and i + 1 < len(args):
-            lang = args[i + 1]
+    # Collect the badscan options that take a value in a single pass
+    options = parse_flag_values(args, BADSCAN_VALUE_FLAGS)
+    include_channels = options.get("--in", [])
+    strictness = options.get("--strictness", ["medium"])[-1]
+    lang = options.get("--lang", ["en"])[-1]
 
     # Validate strictness level
     if strictness not in ["low", "medium", "high"]:
@@ -1874,32 +2281,18 @@ async def scan_bad_words(ctx, *args):
 
     # Process target user if provided
     user = None
-    for i, arg in enumerate(args):
-        if arg.startswith("--user="):
-            user_input = arg[7:]
-            try:
-                # Handle user mention format
-                if user_input.startswith("<@") and user_input.endswith(">"):
-                    user_id = user_input.replace("<@", "").replace("<@!", "").replace(">", "")
-                    user = await bot.fetch_user(int(user_id))
-                else:
-                    # Try to get user by ID
-                    user = await bot.fetch_user(int(user_input))
-            except (ValueError, discord.NotFound, discord.HTTPException):
-                return await ctx.send(f"⚠️ Could not find user: {user_input}")
-
-        elif arg == "--user" and i + 1 < len(args):
-            user_input = args[i + 1]
-            try:
-                # Handle user mention format
-                if user_input.startswith("<@") and user_input.endswith(">"):
-                    user_id = user_input.replace("<@", "").replace("<@!", "").replace(">", "")
-                    user = await bot.fetch_user(int(user_id))
-                else:
-                    # Try to get user by ID
-                    user = await bot.fetch_user(int(user_input))
-            except (ValueError, discord.NotFound, discord.HTTPException):
-                return await ctx.send(f"⚠️ Could not find user: {user_input}")
+    if "--user" in options:
+        user_input = options["--user"][-1]
+        try:
+            # Handle user mention format
+            if user_input.startswith("<@") and user_input.endswith(">"):
+                user_id = user_input.replace("<@", "").replace("<@!", "").replace(">", "")
+                user = await bot.fetch_user(int(user_id))
+            else:
+                # Try to get user by ID
+                user = await bot.fetch_user(int(user_input))
+        except (ValueError, discord.NotFound, discord.HTTPException):
+            return await ctx.send(f"⚠️ Could not find user: {user_input}")
 
     # Prepare search channels
     search_channels = []
@@ -1951,14 +2344,29 @@ async def scan_bad_words(ctx, *args):
     export_notice = f" (results will be exported to `exports/badscans` folder)" if export_results else ""
     status_msg = await ctx.send(f"🔍 Scanning for messages containing bad words{user_filter}{channel_filter} with {strictness} detection ({lang} language, limit: {query_limit}){export_notice}...")
 
+    status_task = None
     try:
         total_channels = len(search_channels)
         found_messages = []
         total_messages = 0
-        start_time = datetime.now()
-        last_update_time = start_time
+        start_time = time.monotonic()
         channels_searched = 0
 
+        # Compile the bad word patterns once per scan instead of once per word for every message
+        word_patterns = []
+        if strictness == "medium":
+            # Consider word boundaries
+            word_patterns = [(word, re.compile(r'\b' + re.escape(word) + r'\b')) for word in bad_words]
+        elif strictness == "high":
+            # Include obfuscation detection
+            for word in bad_words:
+                # Basic obfuscation patterns
+                pattern = ''.join(f"[{c}1!iI|]{{'0,2}}" if c.lower() in 'aeiou' else f"[{c.lower()}{c.upper()}]{{1,2}}" for c in word)
+                word_patterns.append((word, re.compile(pattern)))
+
+        # All patterns joined into one, so messages without bad words are ruled out in a single search
+        any_bad_word = re.compile("|".join(f"(?:{p.pattern})" for _, p in word_patterns)) if word_patterns else None
+
         def text_contains_bad_word(text, strictness_level):
             """Check if text contains bad words and return the matched words"""
             text = text.lower()
@@ -1970,23 +2378,18 @@ async def scan_bad_words(ctx, *args):
                     if f" {word} " in f" {text} " or text == word or text.startswith(f"{word} ") or text.endswith(f" {word}"):
                         found_words.append(word)
 
-            elif strictness_level == "medium":
-                # Consider word boundaries
-                for word in bad_words:
-                    pattern = r'\b' + re.escape(word) + r'\b'
-                    if re.search(pattern, text):
-                        found_words.append(word)
-
-            elif strictness_level == "high":
-                # Include obfuscation detection
-                for word in bad_words:
-                    # Basic obfuscation patterns
-                    pattern = ''.join(f"[{c}1!iI|]{{'0,2}}" if c.lower() in 'aeiou' else f"[{c.lower()}{c.upper()}]{{1,2}}" for c in word)
-                    if re.search(pattern, text):
-                        found_words.append(word)
+            elif any_bad_word is not None and any_bad_word.search(text):
+                found_words = [word for word, pattern in word_patterns if pattern.search(text)]
 
             return found_words
 
+        def render_status():
+            return format_search_status(channels_searched, total_channels, total_messages,
+                                        len(found_messages), start_time, search_cancelled)
+
+        # Progress edits happen in the background so reading history never waits on them
+        status_task = bot.loop.create_task(update_status_periodically(status_msg, render_status))
+
         # Search for messages with bad words in channels
         for channel in search_channels:
             if search_cancelled:
@@ -1994,20 +2397,13 @@ async def scan_bad_words(ctx, *args):
 
             channels_searched += 1
 
-            # Update status message every 5 seconds
-            current_time = datetime.now()
-            if (current_time - last_update_time).total_seconds() >= 5:
-                elapsed = (current_time - start_time).total_seconds()
-                messages_per_second = total_messages / elapsed if elapsed > 0 else 0
-                status = f"🔍 Searching: {channels_searched}/{total_channels} channels, {total_messages:,} messages ({messages_per_second:.1f}/sec), {len(found_messages)} matches..."
-                if search_cancelled:
-                    status = "⚠️ Search cancelled. Finalizing results..."
-                await status_msg.edit(content=status)
-                last_update_time = current_time
-
             try:
                 # Get channel messages
                 async for message in channel.history(limit=query_limit):
+                    # Stop before doing any work once the scan is cancelled
+                    if search_cancelled:
+                        break
+
                     # Skip bot's own messages
                     if message.author.id == bot.user.id:
                         continue
@@ -2023,12 +2419,13 @@ async def scan_bad_words(ctx, *args):
 
                     # Performance tracking
                     if total_messages % 100 == 0 and debug_mode:
-                        elapsed = (datetime.now() - start_time).total_seconds()
+                        elapsed = time.monotonic() - start_time
                         messages_per_second = total_messages / elapsed if elapsed > 0 else 0
                         debug_print(f"Speed: {messages_per_second:.1f} messages/sec - Total: {total_messages:,}", debug_mode)
 
-                # Check if message contains bad words according to strictness
-                    if text_contains_bad_word(message.content, strictness):
+                    # Check if message contains bad words according to strictness
+                    matched_words = text_contains_bad_word(message.content, strictness)
+                    if matched_words:
                         # Format the message for display
                         content = message.content
                         if len(content) > 300:
@@ -2037,7 +2434,6 @@ async def scan_bad_words(ctx, *args):
                         # Strip markdown to avoid formatting issues
                         content = content.replace("```", "'''").replace("`", "'")
 
-                        matched_words = text_contains_bad_word(message.content, strictness)
                         found_messages.append({
                             "id": message.id,
                             "author": f"{message.author.name}",
@@ -2051,7 +2447,7 @@ async def scan_bad_words(ctx, *args):
                         })
 
                     # Check for message limit to avoid throttling
-                    if search_cancelled or len(found_messages) >= 1000:
+                    if len(found_messages) >= 1000:
                         break
 
             except discord.Forbidden:
@@ -2059,8 +2455,10 @@ async def scan_bad_words(ctx, *args):
             except discord.HTTPException:
                 pass
 
+        await stop_status_updates(status_task)
+
         # Calculate search time
-        search_time = (datetime.now() - start_time).total_seconds()
+        search_time = time.monotonic() - start_time
 
         # Show results
         if not found_messages:
@@ -2075,12 +2473,6 @@ async def scan_bad_words(ctx, *args):
                 except Exception as e:
                     await ctx.send(f"⚠️ Failed to export results: {e}")
 
-            # Create chunks to handle Discord's 2000 character limit
-            message_chunks = []
-            current_chunk = f"🔴 **Found {len(found_messages)} messages containing bad words** (searched {total_messages:,} messages in {search_time:.1f}s):\n\n"
-
-            if export_results:
-                current_chunk += f"*Results exported to {export_format.upper()} file*\n\n"
             # Create embed for results
             embed = discord.Embed(
                 title=f"🔎 Bad Words Scan Results",
@@ -2098,17 +2490,18 @@ async def scan_bad_words(ctx, *args):
             found_messages.sort(key=lambda x: x['timestamp'], reverse=True)
 
             # Create message outputs with the new format
-            results_text = ""
+            results_parts = []
             for i, match in enumerate(found_messages[:15]):  # Show only first 15
                 matched_word_list = ", ".join([f"`{word}`" for word in match['matched_words']])
 
-                results_text += f"[{i+1}] **{match['author']}** in #{match['channel_name']}:\n"
-                results_text += f"↳ ⁠{match['content']}\n"
-                results_text += f"↳ ⁠**Bad words detected:** {matched_word_list}\n"
-                results_text += f"↳ ⁠[Jump to message]({match['jump_url']})\n\n"
+                results_parts.append(f"[{i+1}] **{match['author']}** in #{match['channel_name']}:\n")
+                results_parts.append(f"↳ ⁠{match['content']}\n")
+                results_parts.append(f"↳ ⁠**Bad words detected:** {matched_word_list}\n")
+                results_parts.append(f"↳ ⁠[Jump to message]({match['jump_url']})\n\n")
 
             if len(found_messages) > 15:
-                results_text += f"*...and {len(found_messages) - 15} more messages*"
+                results_parts.append(f"*...and {len(found_messages) - 15} more messages*")
+            results_text = "".join(results_parts)
 
             embed.add_field(name="Results", value=results_text, inline=False)
 
@@ -2120,6 +2513,8 @@ async def scan_bad_words(ctx, *args):
     except Exception as e:
         await ctx.send(f"⚠️ Error during scan: {e}")
     finally:
+        if status_task is not None:
+            await stop_status_updates(status_task)
         scan_bad_words.is_running = False
         search_cancelled = False
 
@@ -2153,16 +2548,25 @@ async def clear_cache(ctx):
     if not is_admin(ctx):
         return await ctx.send("❌ You must be a server admin to use this.")
 
-    global member_cache, message_cache, user_cache, keyword_match_cache
+    global member_cache, message_cache, user_cache
 
     member_cache.clear()
     message_cache.clear()
     user_cache.clear()
-    keyword_match_cache.clear()
+    recent_messages.clear()
+    context_cache.clear()
+    context_keys_by_channel.clear()
 
     await ctx.send("✅ All caches cleared successfully.")
 
 
+# The OS and Python version never change while the bot runs, look them up once instead of on every !sysinfo
+SYSTEM_INFO_TEXT = (f"**OS:** {platform.system()} {platform.release()}\n"
+                    f"**Python:** {platform.python_version()}\n"
+                    f"**discord.py:** {discord.__version__}\n"
+                    f"**Process ID:** {os.getpid()}")
+
+
 @bot.command(name="sysinfo", aliases=["sys", "info", "system", "botinfo", "bot", "sinfo", "si", "bi"])
 async def memory_info(ctx):
     """Show system and memory usage statistics"""
@@ -2171,9 +2575,14 @@ async def memory_info(ctx):
 
     loading_msg = await ctx.send("⏳ Building system information embed, please wait...")
 
+    # Reuse the embed built in the last few seconds, its footer still shows when it was generated
+    cached_embed = sysinfo_cache.get("embed")
+    if cached_embed is not None:
+        return await loading_msg.edit(content=None, embed=cached_embed)
+
     try:
         # Get cache statistics using the utility function
-        cache_stats = get_cache_stats(member_cache, message_cache, user_cache, keyword_match_cache)
+        cache_stats = get_cache_stats(member_cache, message_cache, user_cache)
 
         # Get memory usage
         process = psutil.Process()
@@ -2190,10 +2599,7 @@ async def memory_info(ctx):
         # System information
         embed.add_field(
             name="System",
-            value=(f"**OS:** {platform.system()} {platform.release()}\n"
-                   f"**Python:** {platform.python_version()}\n"
-                   f"**discord.py:** {discord.__version__}\n"
-                   f"**Process ID:** {os.getpid()}"),
+            value=SYSTEM_INFO_TEXT,
             inline=False
         )
 
@@ -2220,8 +2626,7 @@ async def memory_info(ctx):
             name="Cache Statistics",
             value=(f"**Members:** {cache_stats['member_count']:,} in {cache_stats['member_guilds']} guilds\n"
                    f"**Messages:** {cache_stats['message_count']:,} across {cache_stats['message_entries']} channels\n"
-                   f"**Users:** {cache_stats['user_count']:,}\n"
-                   f"**Keyword Matches:** {cache_stats['keyword_matches']:,}"),
+                   f"**Users:** {cache_stats['user_count']:,}"),
             inline=False
         )
 
@@ -2231,7 +2636,6 @@ async def memory_info(ctx):
             value=(f"**Member Cache:** {cache_stats['sizes']['member_size']:.2f} KB\n"
                    f"**Message Cache:** {cache_stats['sizes']['message_size']:.2f} KB\n"
                    f"**User Cache:** {cache_stats['sizes']['user_size']:.2f} KB\n"
-                   f"**Keyword Cache:** {cache_stats['sizes']['keyword_size']:.2f} KB\n"
                    f"**Total Cache Size:** {cache_stats['sizes']['total_size']:.2f} KB"),
             inline=True
         )
@@ -2239,9 +2643,9 @@ async def memory_info(ctx):
         # Log file info
         embed.add_field(
             name="Logs",
-            value=(f"**Directory:** `{os.path.dirname(msg_log_path)}`\n"
-                   f"**Message Log:** `{os.path.basename(msg_log_path)}`\n"
-                   f"**User Log:** `{os.path.basename(user_log_path)}`"),
+            value=(f"**Directory:** `{os.path.dirname(msg_handler.baseFilename)}`\n"
+                   f"**Message Log:** `{os.path.basename(msg_handler.baseFilename)}`\n"
+                   f"**User Log:** `{os.path.basename(user_handler.baseFilename)}`"),
             inline=True
         )
 
@@ -2275,6 +2679,7 @@ async def memory_info(ctx):
         # Set footer with timestamp
         embed.set_footer(text=f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+        sysinfo_cache["embed"] = embed
         await loading_msg.edit(content=None, embed=embed)
 
     except Exception as e:
@@ -2290,18 +2695,25 @@ async def list_cache(ctx):
     embed = discord.Embed(title="🗂️ Cache Information", color=0x3498db)
 
     # Member cache information
-    member_cache_text = f"**Guilds cached:** {len(member_cache)}\n"
-    member_cache_text += f"**Total members cached:** {sum(len(members) for members in member_cache.values())}\n"
-    embed.add_field(name="Member Cache", value=member_cache_text, inline=False)
+    member_count, _ = measure_cache(member_cache)
+    embed.add_field(
+        name="Member Cache",
+        value=(f"**Guilds cached:** {len(member_cache)}\n"
+               f"**Total members cached:** {member_count}\n"),
+        inline=False
+    )
 
     # Message cache information
-    message_cache_text = f"**Channel entries:** {len(message_cache)}\n"
-    message_cache_text += f"**Total messages cached:** {sum(len(messages) for messages in message_cache.values())}\n"
-    embed.add_field(name="Message Cache", value=message_cache_text, inline=False)
+    message_count, _ = measure_cache(message_cache)
+    embed.add_field(
+        name="Message Cache",
+        value=(f"**Channel entries:** {len(message_cache)}\n"
+               f"**Total messages cached:** {message_count}\n"),
+        inline=False
+    )
 
     # User cache information
-    user_cache_text = f"**Users cached:** {len(user_cache)}\n"
-    embed.add_field(name="User Cache", value=user_cache_text, inline=False)
+    embed.add_field(name="User Cache", value=f"**Users cached:** {len(user_cache)}\n", inline=False)
 
     await ctx.send(embed=embed)
 
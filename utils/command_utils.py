@@ -1,9 +1,12 @@
 # utils/command_utils.py
+import asyncio
+import io
 import os
 import csv
-import json
 from datetime import datetime
 
+import orjson
+
 
 def setup_command_execution(command_function):
     """Set up initial command execution state and return it if already running"""
@@ -46,6 +49,12 @@ def apply_cooldown(search_cooldowns, ctx, deep_search, custom_query, cooldown_mi
     return True, 0
 
 
+def write_export_file(filename, content):
+    """Write a finished export to disk, meant to run in an executor"""
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
 async def save_scan_results(ctx, found_messages, export_format, user=None, search_channels=None):
     """
     Save scan results to a file in the specified format
@@ -69,29 +78,33 @@ async def save_scan_results(ctx, found_messages, export_format, user=None, searc
     filename = f"exports/badscans/{filename_base}.{export_format}"
 
     if export_format == "txt":
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"Scan Results\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Server: {ctx.guild.name}\n")
-            if user:
-                f.write(f"User: {user.name}\n")
-            if search_channels:
-                channel_names = [f"#{ch.name}" for ch in search_channels]
-                f.write(f"Channels: {', '.join(channel_names)}\n")
-            f.write(f"Messages found: {len(found_messages)}\n")
-            f.write("=" * 80 + "\n\n")
-
-            for i, match in enumerate(found_messages, 1):
-                f.write(f"Message {i}/{len(found_messages)}\n")
-                f.write(f"Author: {match['author']} (ID: {match['author_id']})\n")
-                f.write(f"Channel: #{match['channel_name']} (ID: {match['channel_id']})\n")
-                f.write(f"Date: {match['timestamp']}\n")
-                f.write(f"Link: {match['jump_url']}\n")
-                matched_words = ", ".join(match['matched_words'])
-                f.write(f"Bad words detected: {matched_words}\n")
-                f.write("-" * 40 + "\n\n")
-                f.write(f"Content: {match['content']}\n\n")
-                f.write("-" * 40 + "\n\n")
+        # Collect the report in memory and write it to disk in a single call off the event loop
+        buffer = io.StringIO()
+        buffer.write(f"Scan Results\n")
+        buffer.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        buffer.write(f"Server: {ctx.guild.name}\n")
+        if user:
+            buffer.write(f"User: {user.name}\n")
+        if search_channels:
+            channel_names = [f"#{ch.name}" for ch in search_channels]
+            buffer.write(f"Channels: {', '.join(channel_names)}\n")
+        buffer.write(f"Messages found: {len(found_messages)}\n")
+        buffer.write("=" * 80 + "\n\n")
+
+        for i, match in enumerate(found_messages, 1):
+            buffer.write(f"Message {i}/{len(found_messages)}\n")
+            buffer.write(f"Author: {match['author']} (ID: {match['author_id']})\n")
+            buffer.write(f"Channel: #{match['channel_name']} (ID: {match['channel_id']})\n")
+            buffer.write(f"Date: {match['timestamp']}\n")
+            buffer.write(f"Link: {match['jump_url']}\n")
+            matched_words = ", ".join(match['matched_words'])
+            buffer.write(f"Bad words detected: {matched_words}\n")
+            buffer.write("-" * 40 + "\n\n")
+            buffer.write(f"Content: {match['content']}\n\n")
+            buffer.write("-" * 40 + "\n\n")
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, write_export_file, filename, buffer.getvalue())
 
     elif export_format == "csv":
         with open(filename, "w", encoding="utf-8", newline="") as f:
@@ -131,7 +144,7 @@ async def save_scan_results(ctx, found_messages, export_format, user=None, searc
             "results": found_messages
         }
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(export_data, f, indent=2)
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
 
     return filename
\ No newline at end of file
@@ -0,0 +1,248 @@
+# utils/log_utils.py
+import asyncio
+import ctypes
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import discord
+
+# Shell file operation constants (see shellapi.h)
+FO_DELETE = 0x0003
+FOF_SILENT = 0x0004
+FOF_NOCONFIRMATION = 0x0010
+FOF_NOCONFIRMMKDIR = 0x0200
+FOF_NOERRORUI = 0x0400
+FOF_NORECURSION = 0x1000
+FOF_NO_UI = FOF_SILENT | FOF_NOCONFIRMATION | FOF_NOERRORUI | FOF_NOCONFIRMMKDIR
+
+
+class HourlyLogHandler(logging.FileHandler):
+    """File handler writing to logs_dir/YYYY-MM-DD_HH/filename, moving to a new folder every hour"""
+
+    def __init__(self, logs_dir, filename, encoding="utf-8"):
+        self.logs_dir = logs_dir
+        self.log_filename = filename
+        self.rollover_at = 0
+        super().__init__(self._current_path(time.time()), mode="a", encoding=encoding)
+
+    def _current_path(self, now):
+        """Create the folder for the hour containing now and return the log path inside it"""
+        current_hour = datetime.fromtimestamp(now).replace(minute=0, second=0, microsecond=0)
+        date_hour_dir = os.path.join(self.logs_dir, current_hour.strftime('%Y-%m-%d_%H'))
+        os.makedirs(date_hour_dir, exist_ok=True)
+
+        # Records are only compared against this timestamp until the hour changes
+        self.rollover_at = (current_hour + timedelta(hours=1)).timestamp()
+        return os.path.join(date_hour_dir, self.log_filename)
+
+    def reopen(self, now=None):
+        """Close the current file and open the log file for the current hour"""
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = os.path.abspath(self._current_path(now or time.time()))
+            self.stream = self._open()
+        finally:
+            self.release()
+
+    def emit(self, record):
+        if record.created >= self.rollover_at:
+            self.reopen(record.created)
+
+        # Write without flushing, the listener flushes once the queue is drained
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class DropOldestQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for a bounded queue, discards the oldest queued record when the queue is full"""
+
+    def __init__(self, log_queue, warn_interval=1):
+        super().__init__(log_queue)
+        self.warn_interval = warn_interval
+        self.dropped = 0
+        self._last_warning = 0
+
+    def enqueue(self, record):
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                break
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    continue
+
+        # Report drops at most once per interval instead of once per discarded record
+        if self.dropped:
+            now = time.monotonic()
+            if now - self._last_warning >= self.warn_interval:
+                print(f"⚠️ Log queue full, dropped {self.dropped} oldest records", file=sys.stderr)
+                self.dropped = 0
+                self._last_warning = now
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers once per burst of records instead of after every record"""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+    def enqueue_sentinel(self):
+        # Wait for room instead of failing when stop() is called with a full bounded queue
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        super().stop()
+        # The records handled right before the stop sentinel have not been flushed yet
+        for handler in self.handlers:
+            handler.flush()
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that only runs strftime once per second, records from the same second reuse the text"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_text = ""
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_second = second
+        if not self.default_msec_format:
+            return self._cached_text
+        return self.default_msec_format % (self._cached_text, record.msecs)
+
+
+class DeleteCounter:
+    """Thread-safe count of deleted files, shared between the delete thread and the progress updater"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def add(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+def _shell_delete(paths):
+    """Delete files in a single SHFileOperationW call (Windows only)"""
+    from ctypes import wintypes
+
+    class SHFILEOPSTRUCTW(ctypes.Structure):
+        _fields_ = [
+            ("hwnd", wintypes.HWND),
+            ("wFunc", wintypes.UINT),
+            ("pFrom", ctypes.c_wchar_p),
+            ("pTo", ctypes.c_wchar_p),
+            ("fFlags", ctypes.c_ushort),
+            ("fAnyOperationsAborted", wintypes.BOOL),
+            ("hNameMappings", ctypes.c_void_p),
+            ("lpszProgressTitle", ctypes.c_wchar_p),
+        ]
+
+    # pFrom is a list of paths separated by nulls and ending with a double null
+    buffer = ctypes.create_unicode_buffer("\0".join(os.path.abspath(os.fsdecode(p)) for p in paths) + "\0\0")
+
+    operation = SHFILEOPSTRUCTW()
+    operation.wFunc = FO_DELETE
+    operation.pFrom = ctypes.cast(buffer, ctypes.c_wchar_p)
+    operation.pTo = None
+    operation.fFlags = FOF_NO_UI | FOF_NORECURSION
+
+    result = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(operation))
+    return result == 0 and not operation.fAnyOperationsAborted
+
+
+def delete_files(paths, counter=None):
+    """Delete a batch of files and return how many were removed"""
+    if not paths:
+        return 0
+
+    # One batched shell call is much faster than unlinking file by file on Windows
+    if sys.platform == "win32":
+        try:
+            if _shell_delete(paths):
+                if counter:
+                    counter.add(len(paths))
+                return len(paths)
+        except (OSError, AttributeError):
+            pass
+
+    removed = 0
+    for path in paths:
+        try:
+            os.unlink(path)
+            removed += 1
+            if counter:
+                counter.add()
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def clear_log_folders(logs_dir, prefix="", counter=None):
+    """Delete the log folders whose name starts with prefix and return the number of files removed"""
+    # Work on bytes paths so the per-file calls skip the str <-> bytes filesystem encoding
+    logs_dir = os.fsencode(logs_dir)
+    prefix = os.fsencode(prefix)
+    folders = []
+    files = []
+
+    with os.scandir(logs_dir) as folder_entries:
+        for folder in folder_entries:
+            if not folder.is_dir(follow_symlinks=False) or not folder.name.startswith(prefix):
+                continue
+            folders.append(folder.path)
+            with os.scandir(folder.path) as file_entries:
+                files.extend(entry.path for entry in file_entries if entry.is_file(follow_symlinks=False))
+
+    removed = delete_files(files, counter)
+
+    for folder_path in folders:
+        try:
+            os.rmdir(folder_path)
+        except OSError:
+            continue
+
+    return removed
+
+
+async def update_delete_progress(status_msg, counter, interval=1):
+    """Edit a single status message with the deletion progress at most once per interval"""
+    last_value = 0
+    while True:
+        await asyncio.sleep(interval)
+        if counter.value != last_value:
+            last_value = counter.value
+            try:
+                await status_msg.edit(content=f"🗑️ Clearing logs... ({last_value} files deleted)")
+            except discord.HTTPException:
+                pass
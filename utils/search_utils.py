@@ -1,53 +1,141 @@
 # utils/search_utils.py
+import asyncio
+import time
 from datetime import datetime
 
 import discord
 
+SEARCH_COUNT_MAX_ENTRIES = 10000  # Per-guild and per-user search counts kept in search stats
+
+
+def can_read_history(channel, member):
+    """Check if member can read a channel's message history, avoiding a Forbidden round-trip"""
+    permissions = channel.permissions_for(member)
+    return permissions.read_messages and permissions.read_message_history
+
 
 async def process_search_channels(ctx, include_channels, exclude_channels):
     """Process and return channels to search based on include/exclude filters"""
     search_channels = []
+    # text_channels rebuilds its list on every access, so look it up once per command
+    channels = ctx.guild.text_channels
+    me = ctx.guild.me
 
     if include_channels:
         for ch_name in include_channels:
-            channel = discord.utils.get(ctx.guild.text_channels, name=ch_name)
-            if channel and channel.permissions_for(ctx.guild.me).read_messages:
+            channel = discord.utils.get(channels, name=ch_name)
+            if channel and can_read_history(channel, me):
                 search_channels.append(channel)
         if not search_channels:
             await ctx.send("⚠️ None of the specified channels were found or accessible.")
             return []
     else:
         if exclude_channels:
-            search_channels = [ch for ch in ctx.guild.text_channels
-                               if ch.name not in exclude_channels
-                               and ch.permissions_for(ctx.guild.me).read_messages]
+            # Set lookup keeps the filter linear in the number of channels
+            exclude_names = set(exclude_channels)
+            search_channels = [ch for ch in channels
+                               if ch.name not in exclude_names
+                               and can_read_history(ch, me)]
         else:
-            search_channels = [ch for ch in ctx.guild.text_channels
-                               if ch.permissions_for(ctx.guild.me).read_messages]
+            search_channels = [ch for ch in channels
+                               if can_read_history(ch, me)]
 
     return search_channels
 
 
-async def update_search_status(status_msg, channels_searched, total_channels,
-                               messages_searched, messages_found, start_time,
-                               last_update_time, search_cancelled):
-    """Update status message during search operations"""
-    current_time = datetime.now()
-    if (current_time - last_update_time).total_seconds() > 5:
-        elapsed = (current_time - start_time).total_seconds()
-        messages_per_second = messages_searched / elapsed if elapsed > 0 else 0
-
-        status = f"🔍 Searching: {channels_searched}/{total_channels} channels, " \
-                 f"{messages_searched:,} messages ({messages_per_second:.1f}/sec), " \
-                 f"{messages_found} matches..."
-
-        if search_cancelled:
-            status = "⚠️ Search cancelled! Finalizing results..."
-
-        await status_msg.edit(content=status)
-        return current_time
-
-    return last_update_time
+async def prefetch(iterator, maxsize=200):
+    """Yield from an async iterator while a background task fetches ahead, so the next history page downloads during processing"""
+    queue = asyncio.Queue(maxsize=maxsize)
+    done = object()
+    error = None
+
+    async def produce():
+        nonlocal error
+        try:
+            async for item in iterator:
+                await queue.put(item)
+        except Exception as e:
+            error = e
+        await queue.put(done)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                # Surface errors such as Forbidden to the caller, like iterating directly would
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        producer.cancel()
+
+
+async def scan_channels_concurrently(channels, scan_channel, max_concurrency=8):
+    """Run scan_channel over the channels concurrently and return (channel, result) pairs in channel order"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(channel):
+        async with semaphore:
+            return await scan_channel(channel)
+
+    results = await asyncio.gather(*(run(channel) for channel in channels), return_exceptions=True)
+
+    scanned = []
+    for channel, result in zip(channels, results):
+        # Skip channels we can't read, but surface any other error
+        if isinstance(result, discord.Forbidden):
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        scanned.append((channel, result))
+
+    return scanned
+
+
+def format_search_status(channels_searched, total_channels, messages_searched,
+                         messages_found, start_time, search_cancelled):
+    """Build the progress line shown while a search runs (start_time comes from time.monotonic())"""
+    if search_cancelled:
+        return "⚠️ Search cancelled! Finalizing results..."
+
+    elapsed = time.monotonic() - start_time
+    messages_per_second = messages_searched / elapsed if elapsed > 0 else 0
+    return f"🔍 Searching: {channels_searched}/{total_channels} channels, " \
+           f"{messages_searched:,} messages ({messages_per_second:.1f}/sec), " \
+           f"{messages_found} matches..."
+
+
+async def update_status_periodically(status_msg, render_status, interval=5):
+    """Edit status_msg with render_status() every interval seconds until cancelled, so scans never wait on an edit"""
+    last_status = None
+    while True:
+        await asyncio.sleep(interval)
+        status = render_status()
+        if status != last_status:
+            last_status = status
+            try:
+                await status_msg.edit(content=status)
+            except discord.HTTPException:
+                pass
+
+
+async def stop_status_updates(status_task):
+    """Cancel a status updater and wait for it, so a pending edit can't overwrite the final status"""
+    status_task.cancel()
+    await asyncio.gather(status_task, return_exceptions=True)
+
+
+def count_search(counts, key, max_entries=SEARCH_COUNT_MAX_ENTRIES):
+    """Increment a per-guild or per-user search count, keeping only the top entries once the limit is reached"""
+    # Prune before adding a new key, so the key being counted is never dropped by its own insertion
+    if key not in counts and len(counts) >= max_entries:
+        # Drop the least active half so the stats file doesn't grow with every new name
+        top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:max_entries // 2]
+        counts.clear()
+        counts.update(top)
+    counts[key] = counts.get(key, 0) + 1
 
 
 def update_search_stats(search_stats, ctx, total_searched, found_messages, search_time):
@@ -57,17 +145,9 @@ def update_search_stats(search_stats, ctx, total_searched, found_messages, searc
     search_stats["total_matches_found"] += len(found_messages)
     search_stats["search_time_total"] += search_time
 
-    # Update guild stats
-    guild_name = ctx.guild.name
-    if guild_name not in search_stats["searches_by_guild"]:
-        search_stats["searches_by_guild"][guild_name] = 0
-    search_stats["searches_by_guild"][guild_name] += 1
-
-    # Update user stats
-    user_name = f"{ctx.author.name}"
-    if user_name not in search_stats["searches_by_user"]:
-        search_stats["searches_by_user"][user_name] = 0
-    search_stats["searches_by_user"][user_name] += 1
+    # Update guild and user stats
+    count_search(search_stats["searches_by_guild"], ctx.guild.name)
+    count_search(search_stats["searches_by_user"], ctx.author.name)
 
     # Update last search data
     search_stats["last_search"] = {